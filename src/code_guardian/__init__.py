@@ -9,12 +9,35 @@ __version__ = "0.1.0"
 __author__ = "Shivam"
 __email__ = "shivamjindal0705@gmail.com"
 
-from .analyzer import CodeAnalyzer
-from .scanner import SecurityScanner
-from .performance import PerformanceAnalyzer
-from .maintainability import MaintainabilityScorer
-from .report import ReportGenerator
-from .models import Issue, AnalysisResults
+from importlib import import_module
+
+# Public names are imported on first access so that the CLI (and anything else
+# importing a single submodule) does not pay for the whole package up front
+_LAZY_EXPORTS = {
+    "CodeAnalyzer": ".analyzer",
+    "SecurityScanner": ".scanner",
+    "PerformanceAnalyzer": ".performance",
+    "MaintainabilityScorer": ".maintainability",
+    "ReportGenerator": ".report",
+    "Issue": ".models",
+    "AnalysisResults": ".models",
+}
+
+
+def __getattr__(name):
+    """Import public names lazily (PEP 562)."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes including the lazily imported ones."""
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "CodeAnalyzer",
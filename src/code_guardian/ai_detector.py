@@ -1,21 +1,62 @@
 """AI pattern detector for identifying AI-generated code."""
 
 import re
-from typing import List, Dict, Tuple, Any
+import sys
+from typing import List, Dict, Optional, Pattern, Tuple, Any
 from dataclasses import dataclass
 
 from .config import Config
+from .literals import LiteralMatcher
+from .source import SourceLines
+
+# Used by analyze_code_style to count spacing around '='. Only matches are counted,
+# so a single word character stands in for a whole word: the count is the same and
+# the engine no longer retries \w+ from every character of long identifiers
+_SPACE_AFTER_EQUALS_RE = re.compile(r'=\s+\w')
+_SPACE_BEFORE_EQUALS_RE = re.compile(r'\w\s+=')
+
+
+def _fuse(patterns: List[Tuple[Pattern, float, str]]) -> Pattern:
+    """Combine a category's patterns into one alternation matching if any of them does."""
+    flags = patterns[0][0].flags
+    return re.compile('|'.join(f'(?:{pattern.pattern})' for pattern, _, _ in patterns), flags)
+
+
+def _match_line(line: str, line_num: int, checks: List[Tuple[Pattern, float, str]], pattern_type: str,
+                threshold: float, confidences: List[float], patterns: List['AIPattern']) -> None:
+    """Run one category's patterns over a line, recording every matching confidence."""
+    evidence = None
+    for pattern, confidence, description in checks:
+        if pattern.search(line):
+            confidences.append(confidence)
+            if confidence >= threshold:
+                if evidence is None:
+                    evidence = line.strip()
+                patterns.append(AIPattern(pattern_type, confidence, description, line_num, evidence))
 
 
 @dataclass
 class AIPattern:
     """Represents a detected AI pattern."""
+    __slots__ = ('pattern_type', 'confidence', 'description', 'line_number', 'evidence')
+
     pattern_type: str
     confidence: float
     description: str
     line_number: int
     evidence: str
 
+    def __setstate__(self, state: Tuple[None, Dict[str, Any]]) -> None:
+        """Restore an unpickled pattern, sharing its type and description strings.
+
+        Patterns come back from the result cache and worker processes as pickles,
+        which would otherwise give every one its own copy of those strings.
+        """
+        for name, value in state[1].items():
+            setattr(self, name, value)
+        self.pattern_type = sys.intern(self.pattern_type)
+        self.description = sys.intern(self.description)
+
 
 class AIPatternDetector:
     """Detects patterns commonly found in AI-generated code."""
@@ -24,220 +65,250 @@ class AIPatternDetector:
         """Initialize the AI pattern detector."""
         self.config = config
         self.confidence_threshold = config.get('ai_detection.confidence_threshold', 0.7)
+        # Files shorter than this (in characters) are not scanned at all
+        self.min_file_size = config.get('ai_detection.min_file_size', 200)
         self._init_patterns()
 
     def _init_patterns(self):
-        """Initialize AI detection patterns."""
+        """Initialize AI detection patterns (compiled once, with their flags baked in)."""
         # Comment patterns that indicate AI generation
         self.comment_patterns = [
-            (r'#\s*(This|Here)\s+is\s+(a|an)\s+', 0.8, 'AI-style explanatory comment'),
-            (r'#\s*Note:\s*', 0.7, 'AI-style note comment'),
-            (r'#\s*Important:\s*', 0.7, 'AI-style important comment'),
-            (r'#\s*Example:\s*', 0.6, 'AI-style example comment'),
-            (r'#\s*TODO:\s*Implement\s+', 0.5, 'Generic TODO comment'),
-            (r'#\s*(Initialize|Create|Define)\s+(the|a)\s+', 0.7, 'AI-style action comment'),
-            (r'/\*\*\s*\n\s*\*\s*(This|Here)', 0.8, 'AI-style JSDoc comment'),
+            (re.compile(r'#\s*(This|Here)\s+is\s+(a|an)\s+', re.IGNORECASE), 0.8, 'AI-style explanatory comment'),
+            (re.compile(r'#\s*Note:\s*', re.IGNORECASE), 0.7, 'AI-style note comment'),
+            (re.compile(r'#\s*Important:\s*', re.IGNORECASE), 0.7, 'AI-style important comment'),
+            (re.compile(r'#\s*Example:\s*', re.IGNORECASE), 0.6, 'AI-style example comment'),
+            (re.compile(r'#\s*TODO:\s*Implement\s+', re.IGNORECASE), 0.5, 'Generic TODO comment'),
+            (re.compile(r'#\s*(Initialize|Create|Define)\s+(the|a)\s+', re.IGNORECASE), 0.7, 'AI-style action comment'),
+            (re.compile(r'/\*\*\s*\n\s*\*\s*(This|Here)', re.IGNORECASE), 0.8, 'AI-style JSDoc comment'),
         ]
 
         # Code patterns that suggest AI generation
         self.code_patterns = [
-            (r'if\s+.*\s+is\s+not\s+None\s*:', 0.6, 'Verbose None check'),
-            (r'\.format\(\s*\)', 0.5, 'Empty format() call'),
-            (r'print\s*\(\s*f?["\'].*\{.*\}.*["\']\s*\)', 0.4, 'Debug print statement'),
-            (r'import\s+sys\s*\n.*sys\.path\.append', 0.7, 'Manual path manipulation'),
-            (r'try:\s*\n.*except\s+Exception\s+as\s+e:\s*\n.*print', 0.6, 'Generic exception handling'),
-            (r'def\s+main\s*\(\s*\)\s*:', 0.5, 'Generic main function'),
-            (r'if\s+__name__\s*==\s*["\']__main__["\']:', 0.4, 'Standard main guard'),
+            (re.compile(r'if\s+.*\s+is\s+not\s+None\s*:'), 0.6, 'Verbose None check'),
+            (re.compile(r'\.format\(\s*\)'), 0.5, 'Empty format() call'),
+            (re.compile(r'print\s*\(\s*f?["\'].*\{.*\}.*["\']\s*\)'), 0.4, 'Debug print statement'),
+            (re.compile(r'import\s+sys\s*\n.*sys\.path\.append'), 0.7, 'Manual path manipulation'),
+            (re.compile(r'try:\s*\n.*except\s+Exception\s+as\s+e:\s*\n.*print'), 0.6, 'Generic exception handling'),
+            (re.compile(r'def\s+main\s*\(\s*\)\s*:'), 0.5, 'Generic main function'),
+            (re.compile(r'if\s+__name__\s*==\s*["\']__main__["\']:'), 0.4, 'Standard main guard'),
         ]
 
         # Variable naming patterns
         self.naming_patterns = [
-            (r'\bdata\b', 0.6, 'Generic "data" variable name'),
-            (r'\bresult\b', 0.5, 'Generic "result" variable name'),
-            (r'\bvalue\b', 0.5, 'Generic "value" variable name'),
-            (r'\bitem\b', 0.4, 'Generic "item" variable name'),
-            (r'\btemp\b', 0.6, 'Generic "temp" variable name'),
-            (r'\bmy_\w+', 0.7, 'AI-style "my_" prefixed variables'),
+            (re.compile(r'\bdata\b'), 0.6, 'Generic "data" variable name'),
+            (re.compile(r'\bresult\b'), 0.5, 'Generic "result" variable name'),
+            (re.compile(r'\bvalue\b'), 0.5, 'Generic "value" variable name'),
+            (re.compile(r'\bitem\b'), 0.4, 'Generic "item" variable name'),
+            (re.compile(r'\btemp\b'), 0.6, 'Generic "temp" variable name'),
+            (re.compile(r'\bmy_\w+'), 0.7, 'AI-style "my_" prefixed variables'),
         ]
 
         # Function/class naming patterns
         self.structure_patterns = [
-            (r'class\s+MyClass\s*[\(:]', 0.9, 'Generic "MyClass" class name'),
-            (r'def\s+my_function\s*\(', 0.9, 'Generic "my_function" function name'),
-            (r'def\s+calculate_\w+\s*\(', 0.6, 'AI-style calculate_ function'),
-            (r'def\s+process_\w+\s*\(', 0.6, 'AI-style process_ function'),
-            (r'def\s+handle_\w+\s*\(', 0.6, 'AI-style handle_ function'),
+            (re.compile(r'class\s+MyClass\s*[\(:]'), 0.9, 'Generic "MyClass" class name'),
+            (re.compile(r'def\s+my_function\s*\('), 0.9, 'Generic "my_function" function name'),
+            (re.compile(r'def\s+calculate_\w+\s*\('), 0.6, 'AI-style calculate_ function'),
+            (re.compile(r'def\s+process_\w+\s*\('), 0.6, 'AI-style process_ function'),
+            (re.compile(r'def\s+handle_\w+\s*\('), 0.6, 'AI-style handle_ function'),
         ]
 
         # Import patterns
         self.import_patterns = [
-            (r'import\s+os\s*\n.*import\s+sys\s*\n.*import\s+json', 0.7, 'Common AI import sequence'),
-            (r'from\s+typing\s+import\s+List,\s*Dict,\s*Any', 0.6, 'Common typing imports'),
-            (r'import\s+\w+\s+as\s+\w{1,2}\s*\n', 0.5, 'Short alias imports'),
+            (re.compile(r'import\s+os\s*\n.*import\s+sys\s*\n.*import\s+json', re.MULTILINE), 0.7, 'Common AI import sequence'),
+            (re.compile(r'from\s+typing\s+import\s+List,\s*Dict,\s*Any', re.MULTILINE), 0.6, 'Common typing imports'),
+            (re.compile(r'import\s+\w+\s+as\s+\w{1,2}\s*\n', re.MULTILINE), 0.5, 'Short alias imports'),
         ]
 
         # String patterns
         self.string_patterns = [
-            (r'["\']Hello,?\s+World!?["\']', 0.8, 'Hello World string'),
-            (r'["\']This\s+is\s+a\s+test["\']', 0.7, 'Test string'),
-            (r'["\']Enter\s+\w+:', 0.6, 'Input prompt string'),
-            (r'["\']Processing\s+\w+\.\.\.["\']', 0.6, 'Processing message'),
+            (re.compile(r'["\']Hello,?\s+World!?["\']', re.IGNORECASE), 0.8, 'Hello World string'),
+            (re.compile(r'["\']This\s+is\s+a\s+test["\']', re.IGNORECASE), 0.7, 'Test string'),
+            (re.compile(r'["\']Enter\s+\w+:', re.IGNORECASE), 0.6, 'Input prompt string'),
+            (re.compile(r'["\']Processing\s+\w+\.\.\.["\']', re.IGNORECASE), 0.6, 'Processing message'),
         ]
 
-    def detect_ai_patterns(self, content: str, file_path: str = "") -> Tuple[float, List[AIPattern]]:
-        """Detect AI patterns in code content."""
+        # Interned so unpickled AIPatterns (see __setstate__) share the same objects
+        for patterns in (self.comment_patterns, self.code_patterns, self.naming_patterns,
+                         self.structure_patterns, self.import_patterns, self.string_patterns):
+            patterns[:] = [(pattern, confidence, sys.intern(description))
+                           for pattern, confidence, description in patterns]
+
+        # One alternation per category, searched over the whole content to find the
+        # lines worth checking; the individual patterns then run only on those lines
+        self._comment_re = _fuse(self.comment_patterns)
+        self._code_line_re = _fuse(self.structure_patterns + self.code_patterns)
+        self._naming_re = _fuse(self.naming_patterns)
+        self._string_re = _fuse(self.string_patterns)
+
+        # Literals (case-insensitive) that every pattern in a category requires; a
+        # file containing none of them skips that category's regex search entirely
+        self._comment_literals = LiteralMatcher(['this', 'here', 'note:', 'important:', 'example:',
+                                                 'todo:', 'initialize', 'create', 'define'])
+        self._code_literals = LiteralMatcher(['def', 'class', 'none', '.format(', 'print',
+                                              'sys.path.append', 'except', '__main__'])
+        self._naming_literals = LiteralMatcher(['data', 'result', 'value', 'item', 'temp', 'my_'])
+        self._string_literals = LiteralMatcher(['hello', 'this', 'enter', 'processing'])
+
+    def detect_ai_patterns(self, content: str, file_path: str = "",
+                           lines: Optional[List[str]] = None,
+                           source: Optional[SourceLines] = None) -> Tuple[float, List[AIPattern]]:
+        """Detect AI patterns in code content (lines or source, if given, split content)."""
+        # Tiny files and binary-looking content (a NUL near the start) are not worth
+        # the pattern scan; whitespace-only content could not match anything anyway
+        if len(content) < self.min_file_size or '\x00' in content[:512] or content.isspace():
+            return 0.0, []
+
         detected_patterns = []
-        lines = content.splitlines()
+        if source is None:
+            source = SourceLines(content, lines)
         total_confidence = 0.0
 
+        # Every match counts towards the overall confidence, but only matches at or
+        # above the threshold are reported, so only those become AIPattern objects
+        confidences = []
+
         # Check comment patterns
-        patterns = self._detect_comment_patterns(lines)
+        patterns = self._detect_comment_patterns(source, confidences)
         detected_patterns.extend(patterns)
 
         # Check code structure patterns
-        patterns = self._detect_code_patterns(lines)
+        patterns = self._detect_code_patterns(source, confidences)
         detected_patterns.extend(patterns)
 
         # Check naming patterns
-        patterns = self._detect_naming_patterns(lines)
+        patterns = self._detect_naming_patterns(source, confidences)
         detected_patterns.extend(patterns)
 
         # Check import patterns
-        patterns = self._detect_import_patterns(content)
+        patterns = self._detect_import_patterns(source, confidences)
         detected_patterns.extend(patterns)
 
         # Check string patterns
-        patterns = self._detect_string_patterns(lines)
+        patterns = self._detect_string_patterns(source, confidences)
         detected_patterns.extend(patterns)
 
         # Calculate overall confidence
-        if detected_patterns:
-            # Weight patterns by confidence and normalize
-            confidence_scores = [p.confidence for p in detected_patterns]
+        if confidences:
             # Use weighted average with diminishing returns for multiple patterns
-            total_confidence = min(0.95, sum(confidence_scores) / (len(confidence_scores) + 2))
+            total_confidence = min(0.95, sum(confidences) / (len(confidences) + 2))
         else:
             total_confidence = 0.0
 
-        # Filter patterns above threshold
-        filtered_patterns = [p for p in detected_patterns if p.confidence >= self.confidence_threshold]
+        return total_confidence, detected_patterns
 
-        return total_confidence, filtered_patterns
-
-    def _detect_comment_patterns(self, lines: List[str]) -> List[AIPattern]:
+    def _detect_comment_patterns(self, source: SourceLines, confidences: List[float]) -> List[AIPattern]:
         """Detect AI patterns in comments."""
         patterns = []
 
-        for line_num, line in enumerate(lines, 1):
-            for pattern, confidence, description in self.comment_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    patterns.append(AIPattern(
-                        pattern_type='comment',
-                        confidence=confidence,
-                        description=description,
-                        line_number=line_num,
-                        evidence=line.strip()
-                    ))
+        # Every comment pattern needs a comment marker; skip the regexes otherwise
+        if '#' not in source.content and '/**' not in source.content:
+            return patterns
+        if not self._comment_literals.search(source.content):
+            return patterns
+
+        threshold = self.confidence_threshold
+        for line_num, line in source.matching_lines(self._comment_re):
+            _match_line(line, line_num, self.comment_patterns, 'comment', threshold, confidences, patterns)
 
         return patterns
 
-    def _detect_code_patterns(self, lines: List[str]) -> List[AIPattern]:
+    def _detect_code_patterns(self, source: SourceLines, confidences: List[float]) -> List[AIPattern]:
         """Detect AI patterns in code structure."""
         patterns = []
 
-        for line_num, line in enumerate(lines, 1):
-            # Structure patterns
-            for pattern, confidence, description in self.structure_patterns:
-                if re.search(pattern, line):
-                    patterns.append(AIPattern(
-                        pattern_type='structure',
-                        confidence=confidence,
-                        description=description,
-                        line_number=line_num,
-                        evidence=line.strip()
-                    ))
+        if not self._code_literals.search(source.content):
+            return patterns
+
+        threshold = self.confidence_threshold
+        for line_num, line in source.matching_lines(self._code_line_re):
+            # Structure patterns (all of them start with 'class' or 'def')
+            if 'def' in line or 'class' in line:
+                _match_line(line, line_num, self.structure_patterns, 'structure', threshold, confidences, patterns)
 
             # General code patterns
-            for pattern, confidence, description in self.code_patterns:
-                if re.search(pattern, line):
-                    patterns.append(AIPattern(
-                        pattern_type='code',
-                        confidence=confidence,
-                        description=description,
-                        line_number=line_num,
-                        evidence=line.strip()
-                    ))
+            _match_line(line, line_num, self.code_patterns, 'code', threshold, confidences, patterns)
 
         return patterns
 
-    def _detect_naming_patterns(self, lines: List[str]) -> List[AIPattern]:
+    def _detect_naming_patterns(self, source: SourceLines, confidences: List[float]) -> List[AIPattern]:
         """Detect AI patterns in variable/function naming."""
         patterns = []
 
-        for line_num, line in enumerate(lines, 1):
-            for pattern, confidence, description in self.naming_patterns:
-                matches = re.findall(pattern, line)
-                if matches:
-                    patterns.append(AIPattern(
-                        pattern_type='naming',
-                        confidence=confidence,
-                        description=description,
-                        line_number=line_num,
-                        evidence=line.strip()
-                    ))
+        if not self._naming_literals.search(source.content):
+            return patterns
+
+        threshold = self.confidence_threshold
+        for line_num, line in source.matching_lines(self._naming_re):
+            _match_line(line, line_num, self.naming_patterns, 'naming', threshold, confidences, patterns)
 
         return patterns
 
-    def _detect_import_patterns(self, content: str) -> List[AIPattern]:
+    def _detect_import_patterns(self, source: SourceLines, confidences: List[float]) -> List[AIPattern]:
         """Detect AI patterns in import statements."""
         patterns = []
 
+        if 'import' not in source.content:
+            return patterns
+
         for pattern, confidence, description in self.import_patterns:
-            if re.search(pattern, content, re.MULTILINE):
+            if pattern.search(source.content):
                 # Find the line number of the first import
-                lines = content.splitlines()
-                for line_num, line in enumerate(lines, 1):
+                for line_num, line in enumerate(source.lines, 1):
                     if 'import' in line:
-                        patterns.append(AIPattern(
-                            pattern_type='imports',
-                            confidence=confidence,
-                            description=description,
-                            line_number=line_num,
-                            evidence=line.strip()
-                        ))
+                        confidences.append(confidence)
+                        if confidence >= self.confidence_threshold:
+                            patterns.append(AIPattern(
+                                pattern_type='imports',
+                                confidence=confidence,
+                                description=description,
+                                line_number=line_num,
+                                evidence=line.strip()
+                            ))
                         break
 
         return patterns
 
-    def _detect_string_patterns(self, lines: List[str]) -> List[AIPattern]:
+    def _detect_string_patterns(self, source: SourceLines, confidences: List[float]) -> List[AIPattern]:
         """Detect AI patterns in string literals."""
         patterns = []
 
-        for line_num, line in enumerate(lines, 1):
-            for pattern, confidence, description in self.string_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    patterns.append(AIPattern(
-                        pattern_type='strings',
-                        confidence=confidence,
-                        description=description,
-                        line_number=line_num,
-                        evidence=line.strip()
-                    ))
+        # Only content containing a quote can hold a string literal
+        if '"' not in source.content and "'" not in source.content:
+            return patterns
+        if not self._string_literals.search(source.content):
+            return patterns
+
+        threshold = self.confidence_threshold
+        for line_num, line in source.matching_lines(self._string_re):
+            _match_line(line, line_num, self.string_patterns, 'strings', threshold, confidences, patterns)
 
         return patterns
 
     def analyze_code_style(self, content: str) -> Dict[str, Any]:
         """Analyze overall code style for AI generation indicators."""
         lines = content.splitlines()
-        non_empty_lines = [line for line in lines if line.strip()]
 
-        if not non_empty_lines:
+        # One pass over the lines collects everything the line metrics need; the
+        # lengths of non-empty lines are reduced to their count, sum and sum of squares
+        code_lines = length_sum = length_square_sum = comment_lines = 0
+        for line in lines:
+            stripped = line.strip()
+            if stripped:
+                length = len(line)
+                code_lines += 1
+                length_sum += length
+                length_square_sum += length * length
+                if stripped[0] == '#':
+                    comment_lines += 1
+
+        if not code_lines:
             return {}
 
+        avg_line_length = length_sum / code_lines
         style_metrics = {
-            'avg_line_length': sum(len(line) for line in non_empty_lines) / len(non_empty_lines),
-            'comment_ratio': len([line for line in lines if line.strip().startswith('#')]) / len(lines),
-            'empty_line_ratio': len([line for line in lines if not line.strip()]) / len(lines),
+            'avg_line_length': avg_line_length,
+            'comment_ratio': comment_lines / len(lines),
+            'empty_line_ratio': (len(lines) - code_lines) / len(lines),
             'docstring_present': '"""' in content or "'''" in content,
             'type_hints_present': ': ' in content and '->' in content,
         }
@@ -245,18 +316,18 @@ class AIPatternDetector:
         # AI code often has specific style characteristics
         ai_indicators = {}
 
-        # Very consistent formatting (AI tends to be very consistent)
-        line_lengths = [len(line) for line in non_empty_lines]
-        if line_lengths:
-            length_variance = sum((x - style_metrics['avg_line_length']) ** 2 for x in line_lengths) / len(line_lengths)
-            ai_indicators['consistent_formatting'] = length_variance < 100  # Low variance
+        # Very consistent formatting (AI tends to be very consistent); the variance
+        # n*sum(x^2) - sum(x)^2 over n^2 is compared in exact integer arithmetic
+        length_variance_scaled = code_lines * length_square_sum - length_sum * length_sum
+        ai_indicators['consistent_formatting'] = length_variance_scaled < 100 * code_lines * code_lines  # Low variance
 
         # High comment ratio (AI often over-comments)
         ai_indicators['over_commented'] = style_metrics['comment_ratio'] > 0.3
 
         # Perfect spacing (AI tends to be very consistent with spacing)
-        spacing_patterns = len(re.findall(r'=\s+\w+', content)) + len(re.findall(r'\w+\s+=', content))
-        total_assignments = len(re.findall(r'=', content))
+        spacing_patterns = (sum(1 for _ in _SPACE_AFTER_EQUALS_RE.finditer(content)) +
+                            sum(1 for _ in _SPACE_BEFORE_EQUALS_RE.finditer(content)))
+        total_assignments = content.count('=')
         if total_assignments > 0:
             ai_indicators['perfect_spacing'] = spacing_patterns / total_assignments > 0.8
 
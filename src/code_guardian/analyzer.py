@@ -1,16 +1,48 @@
 """Main analyzer orchestrator for Code Guardian."""
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import fnmatch
+from typing import List, Dict, Any, Iterator, Optional, Pattern, Tuple, Union
+import ast
+import functools
+import hashlib
+import itertools
+import json
+import mmap
+import os
+import time
 
-from .config import Config
-from .models import Issue, AnalysisResults
+from .cache import ASTCache, ResultCache, RACY_WINDOW_NS, relocate
+from .config import Config, matches_exclude
+from .models import Issue, AnalysisResults, SEVERITY_LEVELS
+from .parallel import run_pooled
+from .parsing import parse_python
+from .source import SourceLines
+
+# Below this many files, process start-up costs more than it saves
+MIN_FILES_FOR_PARALLEL = 4
+
+# Read size used if a file grows while it is being read
+_READ_CHUNK = 64 * 1024
+
+# Files at least this large are memory-mapped instead of copied into a buffer
+MMAP_THRESHOLD = 256 * 1024
+
+# Files are read this far ahead of analysis, by this many threads
+_READ_AHEAD = 64
+_READ_THREADS = 8
+
+# A file's (mtime_ns, size, inode, ctime_ns): results cached under it are reused
+# without reading the file
+FileStat = Tuple[int, int, int, int]
 
 
 class CodeAnalyzer:
     """Main analyzer that orchestrates all analysis components."""
 
+    SUPPORTED_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.go', '.rs', '.php'})
+
     def __init__(self, config: Config):
         """Initialize the analyzer with configuration."""
         self.config = config
@@ -26,53 +58,78 @@ class CodeAnalyzer:
         self.maintainability_scorer = MaintainabilityScorer(config) if config.maintainability_enabled else None
         self.ai_detector = AIPatternDetector(config) if config.ai_detection_enabled else None
 
+        # Threads reading files ahead of analysis; pool workers share _READ_THREADS
+        self.read_threads = _READ_THREADS
+
+        # Unchanged files are served whole from the result cache, so parsed trees only
+        # help after a configuration change; unpickling one costs nearly a parse, and
+        # the pickle is several times the size of the source, so this is opt-in
+        self.ast_cache = ASTCache(config.cache_directory) if config.cache_enabled and config.cache_ast else None
+        self.result_cache = ResultCache(config.cache_directory) if config.cache_enabled else None
+
+        # Cached results are only valid for the configuration that produced them
+        self._config_key = hashlib.sha256(
+            json.dumps(config.to_dict(), sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
     def analyze_paths(self, paths: List[str], exclude_patterns: List[str] = None,
                      min_severity: str = 'medium', detect_ai_patterns: bool = True) -> AnalysisResults:
         """Analyze multiple paths (files or directories)."""
-        import time
         start_time = time.time()
 
-        exclude_patterns = exclude_patterns or []
-        exclude_patterns.extend(self.config.exclude_patterns)
+        # Extra patterns (e.g. from the command line) on top of the configured ones
+        exclude_patterns = list(exclude_patterns or [])
 
         # Collect all files to analyze
-        files_to_analyze = []
-        for path_str in paths:
-            path = Path(path_str)
-            if path.is_file():
-                if self._should_analyze_file(path, exclude_patterns):
-                    files_to_analyze.append(path)
-            elif path.is_dir():
-                files_to_analyze.extend(self._collect_files_from_directory(path, exclude_patterns))
+        files_to_analyze, file_stats = self._walk(paths, exclude_patterns)
 
         # Analyze files
         results = AnalysisResults()
         results.files_scanned = len(files_to_analyze)
 
-        all_issues = []
-        ai_scores = []
-
-        for file_path in files_to_analyze:
-            file_issues, file_scores = self._analyze_file(file_path, detect_ai_patterns)
-            all_issues.extend(file_issues)
-            results.file_scores[str(file_path)] = file_scores
-
-            # Collect AI detection scores
-            if 'ai_confidence' in file_scores:
-                ai_scores.append(file_scores['ai_confidence'])
-
-        # Filter issues by minimum severity
-        severity_levels = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
-        min_level = severity_levels.get(min_severity, 1)
-
-        results.issues = [
-            issue for issue in all_issues
-            if severity_levels.get(issue.severity, 0) >= min_level
+        # With every analyzer disabled there is nothing to read or parse
+        if not self.config.any_analysis_enabled:
+            results.file_scores = {file_path: {} for file_path in files_to_analyze}
+            results.execution_time = time.time() - start_time
+            return results
+
+        workers = self._worker_count(len(files_to_analyze))
+        if workers > 1:
+            raw_results = self._analyze_files_parallel(files_to_analyze, detect_ai_patterns, workers,
+                                                       file_stats)
+        else:
+            raw_results = self._analyze_files(files_to_analyze, detect_ai_patterns, file_stats)
+
+        all_issues = raw_results.issues
+        results.file_scores = raw_results.file_scores
+        results.cache_stats = raw_results.cache_stats
+
+        # Collect AI detection scores
+        ai_scores = [
+            scores['ai_confidence']
+            for scores in results.file_scores.values()
+            if 'ai_confidence' in scores
         ]
 
-        # Calculate summary statistics
-        results.security_issues = len([i for i in results.issues if i.category == 'security'])
-        results.performance_issues = len([i for i in results.issues if i.category == 'performance'])
+        # Filter issues by minimum severity (compared as integer levels) and count
+        # the kept ones per category in the same pass
+        min_level = SEVERITY_LEVELS.get(min_severity, SEVERITY_LEVELS['medium'])
+        severity_level = SEVERITY_LEVELS.get
+        kept = []
+        security_issues = performance_issues = 0
+
+        for issue in all_issues:
+            if severity_level(issue.severity, 0) < min_level:
+                continue
+            kept.append(issue)
+            if issue.category == 'security':
+                security_issues += 1
+            elif issue.category == 'performance':
+                performance_issues += 1
+
+        results.issues = kept
+        results.security_issues = security_issues
+        results.performance_issues = performance_issues
 
         # Calculate overall maintainability score
         maintainability_scores = [
@@ -89,68 +146,343 @@ class CodeAnalyzer:
         results.execution_time = time.time() - start_time
         return results
 
-    def _analyze_file(self, file_path: Path, detect_ai_patterns: bool = True) -> tuple:
-        """Analyze a single file and return issues and scores."""
+    def _analyze_files(self, file_paths: List[str], detect_ai_patterns: bool = True,
+                       file_stats: Optional[List[FileStat]] = None) -> AnalysisResults:
+        """Analyze files in this process and return unfiltered per-file results."""
+        partial = AnalysisResults(files_scanned=len(file_paths))
+        counters_before = self._cache_counters()
+        file_stats = file_stats or [None] * len(file_paths)
+
+        for file_path, file_stat, fetched in self._prefetch(file_paths, file_stats, detect_ai_patterns):
+            file_issues, file_scores = self._analyze_file(file_path, detect_ai_patterns, file_stat, fetched)
+            partial.issues.extend(file_issues)
+            partial.file_scores[str(file_path)] = file_scores
+
+        partial.cache_stats = {
+            name: count - counters_before[name]
+            for name, count in self._cache_counters().items()
+        }
+        return partial
+
+    def _prefetch(self, file_paths: List[str], file_stats: List[Optional[FileStat]],
+                  detect_ai_patterns: bool) -> Iterator[Tuple[str, Optional[FileStat], Optional[Future]]]:
+        """Yield files in order while their reads run ahead on a thread pool.
+
+        Reads release the GIL, so they overlap with parsing and analysis of earlier
+        files; at most _READ_AHEAD reads are in flight to bound memory.
+        """
+        if len(file_paths) < 2:
+            for file_path, file_stat in zip(file_paths, file_stats):
+                yield file_path, file_stat, None
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.read_threads, len(file_paths))) as executor:
+            items = zip(file_paths, file_stats)
+            pending = deque()
+
+            def submit(count: int) -> None:
+                for file_path, file_stat in itertools.islice(items, count):
+                    future = executor.submit(self._fetch, file_path, file_stat, detect_ai_patterns)
+                    pending.append((file_path, file_stat, future))
+
+            submit(_READ_AHEAD)
+            while pending:
+                submit(1)
+                yield pending.popleft()
+
+    def _analyze_files_parallel(self, file_paths: List[str], detect_ai_patterns: bool, workers: int,
+                                file_stats: List[FileStat]) -> AnalysisResults:
+        """Analyze files across a process pool, in chunks of a few files per task."""
+        chunk_size = max(1, len(file_paths) // (4 * workers))
+        chunks = [
+            (file_paths[i:i + chunk_size], detect_ai_patterns, file_stats[i:i + chunk_size])
+            for i in range(0, len(file_paths), chunk_size)
+        ]
+
+        # Each worker reads ahead for its own chunks; splitting the read threads
+        # between them keeps the total I/O concurrency that of a serial scan
+        factory = functools.partial(_pooled_analyzer, read_threads=max(1, _READ_THREADS // workers))
+        merged = AnalysisResults(files_scanned=len(file_paths))
+        # Merge in submission order so issues keep the serial ordering
+        for chunk_results in run_pooled(factory, '_analyze_files', chunks, self.config, 1, local=self):
+            _merge_results(merged, chunk_results)
+        return merged
+
+    def _worker_count(self, file_count: int) -> int:
+        """Get the number of worker processes to use for a scan."""
+        if not self.config.parallel_enabled or file_count < MIN_FILES_FOR_PARALLEL:
+            return 1
+        max_workers = self.config.parallel_max_workers or os.cpu_count() or 1
+        return max(1, min(max_workers, file_count))
+
+    def _cache_counters(self) -> Dict[str, int]:
+        """Get the current hit/miss counters of the enabled caches."""
+        counters = {}
+        if self.ast_cache:
+            counters['ast_hits'] = self.ast_cache.hits
+            counters['ast_misses'] = self.ast_cache.misses
+        if self.result_cache:
+            counters['result_hits'] = self.result_cache.hits
+            counters['result_misses'] = self.result_cache.misses
+        return counters
+
+    def _fetch(self, file_path: str, file_stat: Optional[FileStat],
+               detect_ai_patterns: bool) -> Tuple[Optional[str], Optional[tuple], Optional[bytes]]:
+        """Read a file, or its cached results if its stat signature is unchanged.
+
+        Returns (stat_key, cached_results, raw_bytes). Only reads from disk and
+        leaves the cache counters alone, so it is safe to run on read-ahead threads.
+        """
+        # Very recent changes are not trusted, as a same-tick rewrite would go unnoticed;
+        # ctime is checked too, since mtime can be set back (cp -p, tar, rsync)
+        stat_key = None
+        if (self.result_cache and file_stat
+                and time.time_ns() - max(file_stat[0], file_stat[3]) > RACY_WINDOW_NS):
+            stat_key = self.result_cache.stat_key_for(
+                file_path, file_stat, self._config_key, detect_ai_patterns
+            )
+            cached = self.result_cache.lookup(stat_key)
+            if cached is not None:
+                return stat_key, cached, None
+
+        return stat_key, None, _read_bytes(file_path)
+
+    def _analyze_file(self, file_path: Union[str, Path], detect_ai_patterns: bool = True,
+                      file_stat: Optional[FileStat] = None,
+                      fetched: Optional[Future] = None) -> tuple:
+        """Analyze a single file and return issues and scores.
+
+        file_stat is the file's FileStat; when given, results cached for an
+        unchanged stat signature are returned without reading the file. fetched is
+        a pending _fetch() of the file started by _prefetch().
+        """
+        file_path = str(file_path)
         issues = []
         scores = {}
 
         try:
-            # Read file content
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            if fetched is not None:
+                stat_key, cached, raw = fetched.result()
+            else:
+                stat_key, cached, raw = self._fetch(file_path, file_stat, detect_ai_patterns)
+            if cached is not None:
+                self.result_cache.hits += 1
+                return cached
+
+            try:
+                # Unchanged files analyzed with the same configuration are served from cache
+                cache_key = None
+                if self.result_cache:
+                    cache_key = self.result_cache.key_for(
+                        file_path, raw, self._config_key, detect_ai_patterns
+                    )
+                    cached = self.result_cache.get(cache_key)
+                    if cached is not None:
+                        cached = relocate(cached, file_path)
+                        if stat_key:
+                            self.result_cache.put(stat_key, cached)
+                        return cached
+
+                content = _decode_source(raw)
+            finally:
+                if isinstance(raw, mmap.mmap):
+                    raw.close()
+
+            # Parse Python sources and split lines (with their offsets and folded text)
+            # once, sharing both between analyzers
+            tree = self._parse_python(file_path, content)
+            source = SourceLines(content)
+            lines = source.lines
 
             # Security analysis
             if self.security_scanner:
-                security_issues = self.security_scanner.scan_file(str(file_path), content)
+                security_issues = self.security_scanner.scan_file(file_path, content, tree=tree, source=source)
                 issues.extend(security_issues)
 
             # Performance analysis
             if self.performance_analyzer:
-                perf_issues, perf_score = self.performance_analyzer.analyze_file(str(file_path), content)
+                perf_issues, perf_score = self.performance_analyzer.analyze_file(
+                    file_path, content, tree=tree, source=source
+                )
                 issues.extend(perf_issues)
                 scores['performance_score'] = perf_score
 
             # Maintainability analysis
             if self.maintainability_scorer:
-                maint_issues, maint_score = self.maintainability_scorer.score_file(str(file_path), content)
+                maint_issues, maint_score = self.maintainability_scorer.score_file(
+                    file_path, content, tree=tree, lines=lines
+                )
                 issues.extend(maint_issues)
                 scores['maintainability_score'] = maint_score
 
             # AI pattern detection
             if detect_ai_patterns and self.ai_detector:
-                ai_confidence, ai_patterns = self.ai_detector.detect_ai_patterns(content, str(file_path))
+                ai_confidence, ai_patterns = self.ai_detector.detect_ai_patterns(content, file_path, source=source)
                 scores['ai_confidence'] = ai_confidence
                 scores['ai_patterns'] = ai_patterns
 
+            if cache_key:
+                self.result_cache.put(cache_key, (issues, scores))
+            if stat_key:
+                self.result_cache.put(stat_key, (issues, scores))
+
         except Exception as e:
             # Add error as an issue
             issues.append(Issue(
                 severity='medium',
                 category='analysis',
                 message=f'Failed to analyze file: {str(e)}',
-                file_path=str(file_path),
+                file_path=file_path,
                 line_number=0
             ))
 
         return issues, scores
 
-    def _collect_files_from_directory(self, directory: Path, exclude_patterns: List[str]) -> List[Path]:
-        """Recursively collect files from directory."""
-        files = []
-        supported_extensions = {'.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.go', '.rs', '.php'}
-
-        for path in directory.rglob('*'):
-            if path.is_file() and path.suffix in supported_extensions:
-                if self._should_analyze_file(path, exclude_patterns):
-                    files.append(path)
+    def _parse_python(self, file_path: str, content: str) -> Optional[ast.AST]:
+        """Parse a Python file through the AST cache.
 
-        return files
+        Returns None for non-Python files, when no analyzer needs the tree, or when
+        the file cannot be parsed (analyzers then report the error themselves).
+        """
+        if os.path.splitext(file_path)[1] != '.py':
+            return None
+        if not (self.security_scanner or self.performance_analyzer or self.maintainability_scorer):
+            return None
 
-    def _should_analyze_file(self, file_path: Path, exclude_patterns: List[str]) -> bool:
+        try:
+            if self.ast_cache:
+                return self.ast_cache.get_or_parse(content, filename=file_path)
+            return parse_python(content, file_path)
+        except (SyntaxError, ValueError):
+            return None
+
+    def _walk(self, roots: List[str], exclude_patterns: List[str]) -> Tuple[List[str], List[FileStat]]:
+        """Collect the files to analyze as parallel lists of paths and their FileStats.
+
+        Explicitly given files are kept whatever their extension; directories are
+        searched for supported source files.
+        """
+        paths, file_stats = [], []
+        excluded_re = self.config.exclude_re(exclude_patterns)
+        # Directory patterns ('node_modules/') exclude everything below a matching
+        # directory, so the walk does not descend into it at all
+        pruned_re = self.config.exclude_re(exclude_patterns, directories_only=True)
+
+        for root in roots:
+            root = str(Path(root))
+            if os.path.isfile(root):
+                if not matches_exclude(excluded_re, root):
+                    stat = os.stat(root)
+                    paths.append(root)
+                    file_stats.append((stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns))
+            elif os.path.isdir(root):
+                self._walk_directory(root, excluded_re, pruned_re, paths, file_stats)
+
+        return paths, file_stats
+
+    def _walk_directory(self, directory: str, excluded_re: Pattern, pruned_re: Pattern,
+                        paths: List[str], file_stats: List[FileStat]) -> None:
+        """Recursively collect supported files below a directory with os.scandir.
+
+        Files are visited in the same order as Path.rglob (each directory's files,
+        then its subdirectories depth-first); symlinked and excluded directories are
+        not entered.
+        """
+        supported_extensions = self.SUPPORTED_EXTENSIONS
+        pending = [directory]
+
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            subdirectories = []
+            for entry in entries:
+                path_str = entry.name if current == '.' else os.path.join(current, entry.name)
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not matches_exclude(pruned_re, path_str):
+                            subdirectories.append(path_str)
+                        continue
+                    if not entry.is_file() or os.path.splitext(entry.name)[1] not in supported_extensions:
+                        continue
+                    if matches_exclude(excluded_re, path_str):
+                        continue
+                    stat = entry.stat()
+                    # entry.inode() also works on Windows, where stat() leaves st_ino 0
+                    file_stat = (stat.st_mtime_ns, stat.st_size, entry.inode(), stat.st_ctime_ns)
+                except OSError:
+                    continue
+                paths.append(path_str)
+                file_stats.append(file_stat)
+
+            pending.extend(reversed(subdirectories))
+
+    def _should_analyze_file(self, file_path: Union[str, Path], exclude_patterns: List[str]) -> bool:
         """Check if file should be analyzed based on exclude patterns."""
-        path_str = str(file_path)
-
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(path_str, pattern) or fnmatch.fnmatch(file_path.name, pattern):
-                return False
-
-        return True
\ No newline at end of file
+        return not matches_exclude(self.config.exclude_re(exclude_patterns), str(file_path))
+
+
+def _read_bytes(path: str) -> Union[bytes, mmap.mmap]:
+    """Read a whole file with as few read calls as possible.
+
+    Files of MMAP_THRESHOLD bytes or more are returned as a read-only mmap, which
+    the caller must close once it has hashed and decoded it.
+    """
+    fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        remaining = os.fstat(fd).st_size
+        if remaining >= MMAP_THRESHOLD:
+            try:
+                # Length 0 maps the file as it is now, never past its end
+                mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                pass  # e.g. truncated since fstat, or not mappable; read it instead
+            else:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                return mapped
+
+        if hasattr(os, 'posix_fadvise'):
+            # Hint the kernel to read ahead aggressively
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(remaining, _READ_CHUNK))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+
+def _decode_source(raw: Union[bytes, mmap.mmap]) -> str:
+    """Decode file bytes the way Path.read_text(errors='ignore') does.
+
+    Newlines are translated like text mode so line numbers stay the same.
+    """
+    content = str(raw, 'utf-8', 'ignore')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _pooled_analyzer(config: Config, read_threads: int) -> CodeAnalyzer:
+    """Build the analyzer of a pool worker process, with its share of the read threads."""
+    analyzer = CodeAnalyzer(config)
+    analyzer.read_threads = read_threads
+    return analyzer
+
+
+def _merge_results(merged: AnalysisResults, partial: AnalysisResults) -> None:
+    """Merge partial results from a worker into the combined results."""
+    merged.issues.extend(partial.issues)
+    merged.file_scores.update(partial.file_scores)
+    for name, count in partial.cache_stats.items():
+        merged.cache_stats[name] = merged.cache_stats.get(name, 0) + count
@@ -0,0 +1,211 @@
+"""Persistent on-disk caches for Code Guardian."""
+
+import ast
+import hashlib
+import os
+import pickle
+import stat
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Optional, Tuple, Union
+
+from . import __version__
+from .parsing import parse_python
+
+# Bumped whenever the cached payload format changes
+CACHE_FORMAT_VERSION = 3
+
+# Parsed trees are only valid for the interpreter that produced them
+VERSION_SALT = (
+    f'{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}'
+    f':{__version__}:{CACHE_FORMAT_VERSION}'
+).encode('utf-8')
+
+# Files modified more recently than this are not looked up by stat signature,
+# since a rewrite within the same timestamp tick would keep mtime and size
+RACY_WINDOW_NS = 2_000_000_000
+
+# Entries written longer ago than this are deleted (once per cache instance, on
+# its first store), which bounds a cache that sees ever-new content and configs
+MAX_ENTRY_AGE_S = 30 * 24 * 60 * 60
+
+
+def relocate(results: tuple, file_path: str) -> tuple:
+    """Point cached (issues, scores) results at file_path; they may come from an identical file elsewhere."""
+    issues, scores = results
+    if any(issue.file_path != file_path for issue in issues):
+        issues = [replace(issue, file_path=file_path) for issue in issues]
+    return issues, scores
+
+
+def is_private_directory(path: Path) -> bool:
+    """Check that a directory, if it exists, is owned by this user and not writable by others.
+
+    Cache entries are unpickled, so a directory someone else can write to must
+    not be trusted.
+    """
+    if not hasattr(os, 'getuid'):
+        return True  # No POSIX ownership to check
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return True  # Created with private permissions on first store
+    except OSError:
+        return False
+    return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+class _DiskCache:
+    """Content-addressed pickle store under a cache directory."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize the cache rooted at the given directory."""
+        self.directory = Path(directory)
+        self.hits = 0
+        self.misses = 0
+
+        # Entries are only read from (and written to) directories private to this user
+        self.trusted = is_private_directory(self.directory.parent) and is_private_directory(self.directory)
+        self._pruned = False
+
+    def _path_for(self, key: str) -> Path:
+        """Get the file path for a cache key (sharded by key prefix)."""
+        return self.directory / key[:2] / key
+
+    def _load(self, key: str) -> Optional[Any]:
+        """Load a cached value, returning None on a miss or unreadable entry."""
+        if not self.trusted:
+            return None
+        try:
+            with open(self._path_for(key), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Corrupted or incompatible entries are treated as misses
+            return None
+
+    def _store(self, key: str, value: Any) -> None:
+        """Store a value atomically; failures to write are not fatal."""
+        if not self.trusted:
+            return
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+        path = self._path_for(key)
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+
+    def prune(self, max_age: float = MAX_ENTRY_AGE_S) -> None:
+        """Delete entries (and leftover temporary files) written more than max_age seconds ago."""
+        cutoff = time.time() - max_age
+        try:
+            shards = [entry.path for entry in os.scandir(self.directory) if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for shard in shards:
+            try:
+                with os.scandir(shard) as entries:
+                    for entry in entries:
+                        if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                            os.unlink(entry.path)
+            except OSError:
+                pass
+
+
+class ASTCache(_DiskCache):
+    """Caches parsed Python ASTs keyed by source content and interpreter version."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize the AST cache inside the given cache directory."""
+        super().__init__(Path(directory) / 'ast')
+
+    @staticmethod
+    def key_for(source: Union[str, bytes]) -> str:
+        """Compute the cache key for a piece of source code."""
+        if isinstance(source, str):
+            source = source.encode('utf-8', errors='surrogatepass')
+        return hashlib.sha256(source + VERSION_SALT).hexdigest()
+
+    def get_or_parse(self, source: Union[str, bytes], filename: str = '<unknown>') -> ast.Module:
+        """Return the cached AST for source, parsing and storing it on a miss.
+
+        Raises SyntaxError (and is not cached) if the source cannot be parsed.
+        """
+        key = self.key_for(source)
+        tree = self._load(key)
+        if tree is not None:
+            self.hits += 1
+            return tree
+
+        self.misses += 1
+        tree = parse_python(source, filename)
+        self._store(key, tree)
+        return tree
+
+
+class ResultCache(_DiskCache):
+    """Caches per-file analysis results keyed by file, content and configuration."""
+
+    def __init__(self, directory: Union[str, Path]):
+        """Initialize the result cache inside the given cache directory."""
+        super().__init__(Path(directory) / 'results')
+
+    @staticmethod
+    def key_for(file_path: str, source: Union[str, bytes], config_key: str, *extra: Any) -> str:
+        """Compute the cache key for a file's analysis results.
+
+        Only the file name goes into the key (analyzers look at nothing else of the
+        path), so identical files in different directories share one entry. Cached
+        issues therefore carry whichever path stored them; callers must pass them
+        through relocate() before use.
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8', errors='surrogatepass')
+        digest = hashlib.sha256(VERSION_SALT)
+        digest.update(repr((os.path.basename(file_path), config_key) + extra).encode('utf-8'))
+        digest.update(source)
+        return digest.hexdigest()
+
+    @staticmethod
+    def stat_key_for(file_path: str, file_stat: Tuple[int, ...], config_key: str, *extra: Any) -> str:
+        """Compute a cache key from a file's stat signature instead of its content.
+
+        file_stat is the file's (mtime_ns, size, inode, ctime_ns). The path is resolved,
+        so the same relative path in another checkout or working directory (where a
+        copy may well keep mtime and size) never shares a key.
+        """
+        signature = ('stat', os.path.realpath(file_path), tuple(file_stat), config_key) + extra
+        return hashlib.sha256(VERSION_SALT + repr(signature).encode('utf-8')).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Any]:
+        """Get cached results without touching the hit/miss counters."""
+        return self._load(key)
+
+    def get(self, key: str, count_miss: bool = True) -> Optional[Any]:
+        """Get cached results for a key, or None if they are not cached."""
+        value = self.lookup(key)
+        if value is None:
+            if count_miss:
+                self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store results for a key."""
+        self._store(key, value)
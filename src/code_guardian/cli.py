@@ -1,16 +1,23 @@
 """Command-line interface for Code Guardian."""
 
 import click
+import sys
+from functools import cache
 from pathlib import Path
 from typing import Optional, List
-from rich.console import Console
-from rich.table import Table
 
-from .analyzer import CodeAnalyzer
 from .config import Config
-from .models import AnalysisResults
+from .models import AnalysisResults, SEVERITY_LEVELS
 
-console = Console()
+# Rich styles indexed by severity level (low, medium, high, critical)
+_COLORS = ('blue', 'yellow', 'red', 'bold red')
+
+
+@cache
+def _console():
+    """Get the shared rich console, importing rich on first use."""
+    from rich.console import Console
+    return Console()
 
 
 @click.group()
@@ -33,8 +40,10 @@ def cli():
 @click.option('--exclude', multiple=True, help='Patterns to exclude')
 @click.option('--include-ai-patterns/--no-ai-patterns', default=True,
               help='Include AI-generated code pattern detection')
+@click.option('--no-cache', is_flag=True, default=False,
+              help='Disable the on-disk analysis cache')
 def scan(paths: tuple, config: Optional[str], format: str, output: Optional[str],
-         severity: str, exclude: tuple, include_ai_patterns: bool):
+         severity: str, exclude: tuple, include_ai_patterns: bool, no_cache: bool):
     """Scan code files for quality and security issues."""
 
     if not paths:
@@ -43,12 +52,15 @@ def scan(paths: tuple, config: Optional[str], format: str, output: Optional[str]
     try:
         # Load configuration
         config_obj = Config.load(config) if config else Config()
+        if no_cache:
+            config_obj.set('cache.enabled', False)
 
         # Initialize analyzer
+        from .analyzer import CodeAnalyzer
         analyzer = CodeAnalyzer(config_obj)
 
         # Scan files
-        console.print("[bold blue]🔍 Scanning code files...[/bold blue]")
+        _console().print("[bold blue]🔍 Scanning code files...[/bold blue]")
 
         results = analyzer.analyze_paths(
             list(paths),
@@ -71,19 +83,27 @@ def scan(paths: tuple, config: Optional[str], format: str, output: Optional[str]
                 output_file = output or 'ai-guardian-report.html'
                 generator.generate_html_report(results, output_file)
 
-            console.print(f"[green]✅ Report saved to {output_file}[/green]")
+            _console().print(f"[green]✅ Report saved to {output_file}[/green]")
 
         # Exit with error code if issues found
         if results.has_critical_issues():
             raise click.ClickException("Critical issues found!")
 
     except Exception as e:
-        console.print(f"[red]❌ Error: {e}[/red]")
+        _console().print(f"[red]❌ Error: {e}[/red]")
         raise click.Abort()
 
 
 def display_cli_report(results):
     """Display results in CLI format."""
+    # Piped output (CI logs) gets plain text; rich's layout and ANSI codes would be wasted
+    if not sys.stdout.isatty():
+        _display_plain_report(results)
+        return
+
+    from rich.table import Table
+
+    console = _console()
     console.print("\n[bold]📊 Analysis Results[/bold]\n")
 
     # Summary table
@@ -92,15 +112,8 @@ def display_cli_report(results):
     table.add_column("Value", justify="right")
     table.add_column("Status", justify="center")
 
-    # Add summary rows
-    table.add_row("Files Scanned", str(results.files_scanned), "ℹ️")
-    table.add_row("Security Issues", str(results.security_issues),
-                  "🔴" if results.security_issues > 0 else "✅")
-    table.add_row("Performance Issues", str(results.performance_issues),
-                  "🟡" if results.performance_issues > 0 else "✅")
-    table.add_row("Maintainability Score", f"{results.maintainability_score:.1f}/10",
-                  "🟢" if results.maintainability_score >= 7 else "🟡")
-    table.add_row("AI-Generated Code", f"{results.ai_generated_percentage:.1f}%", "ℹ️")
+    for row in _summary_rows(results):
+        table.add_row(*row)
 
     console.print(table)
 
@@ -108,22 +121,58 @@ def display_cli_report(results):
     if results.issues:
         console.print("\n[bold red]🚨 Issues Found:[/bold red]\n")
         for issue in results.issues[:10]:  # Show top 10
-            console.print(f"[{get_severity_color(issue.severity)}]● {issue.severity.upper()}[/]: "
+            level = SEVERITY_LEVELS.get(issue.severity)
+            color = _COLORS[level] if level is not None else 'white'
+            console.print(f"[{color}]● {issue.severity.upper()}[/]: "
                          f"{issue.message} ({issue.file_path}:{issue.line_number})")
 
         if len(results.issues) > 10:
             console.print(f"\n... and {len(results.issues) - 10} more issues")
 
 
+def _display_plain_report(results):
+    """Display results as plain text, one write per section."""
+    rows = _summary_rows(results)
+    width = max(len(metric) for metric, _, _ in rows)
+    sys.stdout.write("\nAnalysis Results\n\n" +
+                     "".join(f"{metric:<{width}}  {value}\n" for metric, value, _ in rows))
+
+    if results.issues:
+        sys.stdout.write("\nIssues Found:\n\n" + "".join(
+            f"* {issue.severity.upper()}: {issue.message} ({issue.file_path}:{issue.line_number})\n"
+            for issue in results.issues[:10]  # Show top 10
+        ))
+
+        if len(results.issues) > 10:
+            sys.stdout.write(f"\n... and {len(results.issues) - 10} more issues\n")
+
+
+def _summary_rows(results) -> List[tuple]:
+    """Get the (metric, value, status) rows of the summary table."""
+    rows = [
+        ("Files Scanned", str(results.files_scanned), "ℹ️"),
+        ("Security Issues", str(results.security_issues),
+         "🔴" if results.security_issues > 0 else "✅"),
+        ("Performance Issues", str(results.performance_issues),
+         "🟡" if results.performance_issues > 0 else "✅"),
+        ("Maintainability Score", f"{results.maintainability_score:.1f}/10",
+         "🟢" if results.maintainability_score >= 7 else "🟡"),
+        ("AI-Generated Code", f"{results.ai_generated_percentage:.1f}%", "ℹ️"),
+    ]
+    if 'ast_hits' in results.cache_stats:
+        rows.append(("AST Cache", f"{results.cache_stats['ast_hits']} hits / "
+                     f"{results.cache_stats['ast_misses']} misses", "ℹ️"))
+    if 'result_hits' in results.cache_stats:
+        looked_up = results.cache_stats['result_hits'] + results.cache_stats['result_misses']
+        hit_rate = results.cache_stats['result_hits'] / looked_up * 100 if looked_up else 0.0
+        rows.append(("Result Cache", f"{hit_rate:.0f}% hit rate", "ℹ️"))
+    return rows
+
+
 def get_severity_color(severity: str) -> str:
     """Get color for severity level."""
-    colors = {
-        'critical': 'bold red',
-        'high': 'red',
-        'medium': 'yellow',
-        'low': 'blue'
-    }
-    return colors.get(severity, 'white')
+    level = SEVERITY_LEVELS.get(severity)
+    return _COLORS[level] if level is not None else 'white'
 
 
 @cli.command()
@@ -133,7 +182,7 @@ def init(path: str):
     config_path = Path(path) / '.ai-guardian.yml'
 
     if config_path.exists():
-        console.print("[yellow]⚠️  Configuration file already exists![/yellow]")
+        _console().print("[yellow]⚠️  Configuration file already exists![/yellow]")
         return
 
     # Create default configuration
@@ -178,7 +227,7 @@ reporting:
 """
 
     config_path.write_text(default_config)
-    console.print(f"[green]✅ Configuration initialized at {config_path}[/green]")
+    _console().print(f"[green]✅ Configuration initialized at {config_path}[/green]")
 
 
 def main():
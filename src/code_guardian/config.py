@@ -1,8 +1,74 @@
 """Configuration management for Code Guardian."""
 
+from functools import cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-import yaml
+from typing import Dict, Any, Iterable, Iterator, Optional, Pattern, Tuple
+import fnmatch
+import os
+import re
+
+
+@cache
+def _yaml() -> Tuple[Any, Any, Any]:
+    """Import PyYAML on first use; only loading and saving config files need it.
+
+    Returns the module with its safe loader and dumper, preferring the
+    libyaml-backed implementations when PyYAML was built with them.
+    """
+    import yaml
+    try:
+        from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeDumper, SafeLoader
+    return yaml, SafeLoader, SafeDumper
+
+
+def default_cache_directory() -> str:
+    """Get the per-user cache directory ($XDG_CACHE_HOME/code_guardian or ~/.cache/code_guardian).
+
+    The caches hold pickles, so they must not live in the scanned checkout where
+    a planted file would be loaded.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'code_guardian')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate an exclude glob into a regex.
+
+    Patterns ending in '/' (e.g. 'node_modules/') match that directory and
+    everything below it, wherever it appears in a path.
+    """
+    if pattern.endswith('/') and pattern.rstrip('/'):
+        body = fnmatch.translate(pattern.rstrip('/'))
+        if body.endswith('\\Z'):
+            body = body[:-2]
+        return rf'(?:.*/)?{body}(?:/.*)?\Z'
+    return fnmatch.translate(pattern)
+
+
+def compile_exclude_patterns(patterns: Iterable[str]) -> Pattern:
+    """Compile exclude globs into a single regex alternation."""
+    alternatives = [f'(?:{_glob_to_regex(p)})' for p in patterns]
+    if not alternatives:
+        return re.compile(r'(?!)')  # Matches nothing
+    return re.compile('|'.join(alternatives))
+
+
+def _iter_flat(config: Dict[str, Any], prefix: str = '') -> Iterator[Tuple[str, Any]]:
+    """Yield (dotted_key, value) pairs for every key of a nested config dict."""
+    for key, value in config.items():
+        dotted_key = f'{prefix}{key}'
+        yield dotted_key, value
+        if isinstance(value, dict):
+            yield from _iter_flat(value, f'{dotted_key}.')
+
+
+def matches_exclude(excluded_re: Pattern, path: str) -> bool:
+    """Check a path (or its file name) against a compiled exclude regex."""
+    if os.sep != '/':
+        path = path.replace(os.sep, '/')
+    return bool(excluded_re.match(path) or excluded_re.match(path.rsplit('/', 1)[-1]))
 
 
 class Config:
@@ -11,6 +77,7 @@ class Config:
     def __init__(self, config_dict: Optional[Dict[str, Any]] = None):
         """Initialize configuration with default values."""
         self._config = config_dict or self._get_default_config()
+        self._flatten()
 
     @staticmethod
     def _get_default_config() -> Dict[str, Any]:
@@ -31,17 +98,20 @@ class Config:
                 'check_memory_usage': True,
                 'check_inefficient_loops': True,
                 'max_complexity': 10,
+                'max_file_size': 1048576,
             },
             'maintainability': {
                 'enabled': True,
                 'max_complexity': 10,
                 'max_function_length': 50,
                 'max_class_methods': 20,
+                'max_file_size': 1048576,
                 'check_naming_conventions': True,
             },
             'ai_detection': {
                 'enabled': True,
                 'confidence_threshold': 0.7,
+                'min_file_size': 200,
                 'check_comment_patterns': True,
                 'check_code_patterns': True,
             },
@@ -59,6 +129,16 @@ class Config:
                 'include_source_snippets': True,
                 'max_issues_per_file': 20,
                 'show_ai_confidence': True,
+                'pretty': False,
+            },
+            'cache': {
+                'enabled': True,
+                'directory': default_cache_directory(),
+                'ast': False,
+            },
+            'parallel': {
+                'enabled': True,
+                'max_workers': 0,
             }
         }
 
@@ -77,25 +157,22 @@ class Config:
                 # No config file found, use defaults
                 return cls()
 
+        yaml, safe_loader, _ = _yaml()
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                config_data = yaml.safe_load(f)
+                config_data = yaml.load(f, Loader=safe_loader)
             return cls(config_data)
         except (yaml.YAMLError, FileNotFoundError, PermissionError) as e:
             raise ValueError(f"Failed to load configuration from {path}: {e}")
 
+    def _flatten(self) -> None:
+        """Index every value by its dotted key and re-resolve the derived attributes."""
+        self._flat = dict(_iter_flat(self._config)) if isinstance(self._config, dict) else {}
+        self._resolve()
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key (supports dot notation)."""
-        keys = key.split('.')
-        value = self._config
-
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-
-        return value
+        return self._flat.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
         """Set configuration value by key (supports dot notation)."""
@@ -109,45 +186,57 @@ class Config:
 
         config[keys[-1]] = value
 
-    @property
-    def security_enabled(self) -> bool:
-        """Check if security scanning is enabled."""
-        return self.get('security.enabled', True)
-
-    @property
-    def performance_enabled(self) -> bool:
-        """Check if performance analysis is enabled."""
-        return self.get('performance.enabled', True)
-
-    @property
-    def maintainability_enabled(self) -> bool:
-        """Check if maintainability scoring is enabled."""
-        return self.get('maintainability.enabled', True)
+        # Re-resolve derived values that depend on the old configuration
+        self._flatten()
+
+    def _resolve(self) -> None:
+        """Resolve frequently read settings into plain attributes.
+
+        Analyzers check these on every file (and some on every node), so they are
+        computed once here and again whenever set() changes the configuration.
+        """
+        get = self._flat.get
+
+        self.security_enabled = get('security.enabled', True)
+        self.performance_enabled = get('performance.enabled', True)
+        self.maintainability_enabled = get('maintainability.enabled', True)
+        self.ai_detection_enabled = get('ai_detection.enabled', True)
+        self.any_analysis_enabled = bool(self.security_enabled or self.performance_enabled or
+                                         self.maintainability_enabled or self.ai_detection_enabled)
+        self.exclude_patterns = tuple(get('exclude', None) or ())
+        self.security_threshold = get('security.severity_threshold', 'medium')
+        self.max_complexity = get('performance.max_complexity', 10)
+        self.ai_confidence_threshold = get('ai_detection.confidence_threshold', 0.7)
+        self.cache_enabled = get('cache.enabled', True)
+        self.cache_directory = get('cache.directory', None) or default_cache_directory()
+        self.cache_ast = get('cache.ast', False)
+        self.parallel_enabled = get('parallel.enabled', True)
+        self.parallel_max_workers = get('parallel.max_workers', 0)
+
+        # Compiled exclude regexes, keyed by the full tuple of patterns they cover
+        self._exclude_res: Dict[Tuple[str, ...], Pattern] = {}
+
+    def exclude_re(self, extra_patterns: Iterable[str] = (), directories_only: bool = False) -> Pattern:
+        """Get the configured exclude patterns, plus any extra ones, compiled into one regex.
+
+        With directories_only, only the directory patterns (ending in '/') are used.
+        """
+        patterns = self.exclude_patterns + tuple(extra_patterns)
+        if directories_only:
+            patterns = tuple(p for p in patterns if p.endswith('/') and p.rstrip('/'))
+        excluded_re = self._exclude_res.get(patterns)
+        if excluded_re is None:
+            excluded_re = self._exclude_res[patterns] = compile_exclude_patterns(patterns)
+        return excluded_re
 
     @property
-    def ai_detection_enabled(self) -> bool:
-        """Check if AI pattern detection is enabled."""
-        return self.get('ai_detection.enabled', True)
+    def excluded_re(self) -> Pattern:
+        """Get the configured exclude patterns compiled into a single regex."""
+        return self.exclude_re()
 
-    @property
-    def exclude_patterns(self) -> List[str]:
-        """Get list of exclude patterns."""
-        return self.get('exclude', [])
-
-    @property
-    def security_threshold(self) -> str:
-        """Get security severity threshold."""
-        return self.get('security.severity_threshold', 'medium')
-
-    @property
-    def max_complexity(self) -> int:
-        """Get maximum allowed complexity."""
-        return self.get('performance.max_complexity', 10)
-
-    @property
-    def ai_confidence_threshold(self) -> float:
-        """Get AI detection confidence threshold."""
-        return self.get('ai_detection.confidence_threshold', 0.7)
+    def is_excluded(self, path: str) -> bool:
+        """Check if a path matches any configured exclude pattern."""
+        return matches_exclude(self.excluded_re, path)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert configuration to dictionary."""
@@ -155,5 +244,6 @@ class Config:
 
     def save(self, path: str) -> None:
         """Save configuration to file."""
+        yaml, _, safe_dumper = _yaml()
         with open(path, 'w', encoding='utf-8') as f:
-            yaml.dump(self._config, f, default_flow_style=False, indent=2)
\ No newline at end of file
+            yaml.dump(self._config, f, Dumper=safe_dumper, default_flow_style=False, indent=2)
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""Linear-time line checks and candidate searches for '.*'-gapped regex patterns."""
+
+import re
+from typing import Any, Callable, List, Optional, Pattern, Tuple
+
+from .literals import lower_literals
+
+# Regex source tokens: an escape, a character class, the '.*' gap between a
+# pattern's pieces, or one character
+SOURCE_TOKEN_RE = re.compile(r'\\.|\[\^?\]?(?:\\.|[^\]\\])*\]|\.\*|.', re.DOTALL)
+
+# Tokens that match exactly one character; anything else (quantifiers, groups,
+# alternation, anchors) makes a piece variable-width or is not split through
+SINGLE_CHAR_TOKEN_RE = re.compile(r'\\[^\dbBAZ]|\[.+\]|[^\\.*+?{}\[\]()|^$]|\.', re.DOTALL)
+
+# Tokens that match a position rather than text; a piece with one may match in a
+# window of a line but not in a wider one
+_ASSERTION_TOKENS = frozenset(['^', '$', '\\b', '\\B', '\\A', '\\Z'])
+
+
+def split_pieces(source: str) -> Optional[List[str]]:
+    """Split a regex source at its '.*' gaps into the pieces that must appear in order.
+
+    Returns None for sources with groups or alternation, or with a quantified gap
+    ('.*?', '.*+'), which are not split. Empty pieces (a leading or trailing '.*')
+    are dropped.
+    """
+    tokens = SOURCE_TOKEN_RE.findall(source)
+    if any(token in ('(', '[', '|') for token in tokens):
+        return None
+    pieces = ['']
+    for token in tokens:
+        if token == '.*':
+            pieces.append('')
+        elif token in ('*', '+', '?', '{') and not pieces[-1]:
+            return None
+        else:
+            pieces[-1] += token
+    return [piece for piece in pieces if piece]
+
+
+def is_fixed_width(piece: str) -> bool:
+    """Check if every token of a piece matches exactly one character."""
+    return all(SINGLE_CHAR_TOKEN_RE.fullmatch(token) for token in SOURCE_TOKEN_RE.findall(piece))
+
+
+def needs_newline(piece: str) -> bool:
+    """Check if a piece contains a '\\n' that is not optional."""
+    tokens = SOURCE_TOKEN_RE.findall(piece) + ['']
+    return any(token == '\\n' and tokens[index + 1] not in ('*', '?', '{')
+               for index, token in enumerate(tokens[:-1]))
+
+
+def _earliest_end(piece: Pattern, line: str, pos: int, match: Any) -> int:
+    """Get the smallest end of a match of piece in line[pos:], given its leftmost match.
+
+    Whether piece matches within line[pos:end] only changes once as end grows, so
+    the end is found by bisection between the match's start and its end.
+    """
+    low, high = match.start(), match.end()
+    while low < high:
+        middle = (low + high) // 2
+        if piece.search(line, pos, middle) is None:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def line_matcher(pattern: Pattern) -> Callable[[str], Any]:
+    """Build a check that is truthy exactly when pattern.search(line) is, for a single line.
+
+    Patterns like '.*\\+=.*\\[.*\\]' backtrack through every combination of their
+    '.*' gaps on lines that almost match, which takes quadratic or cubic time on
+    long lines. A line matches exactly when each piece can be matched after the
+    earliest end of the previous one, so the pieces are searched one after
+    another instead. A fixed-width piece's leftmost match also ends first; for
+    other pieces the earliest end is bisected. Patterns that need a newline
+    never match a line. Anything else is searched as it is.
+    """
+    pieces = split_pieces(pattern.pattern)
+    if pieces is None:
+        return pattern.search
+    if any(needs_newline(piece) for piece in pieces):
+        return lambda line: False  # Lines never contain '\n'
+    if len(pieces) < 2 or any(_ASSERTION_TOKENS.intersection(SOURCE_TOKEN_RE.findall(piece))
+                              for piece in pieces):
+        return pattern.search
+
+    compiled = tuple((re.compile(piece, pattern.flags), is_fixed_width(piece)) for piece in pieces[:-1])
+    last = re.compile(pieces[-1], pattern.flags)
+
+    def matches(line: str) -> bool:
+        pos = 0
+        for piece, fixed_width in compiled:
+            match = piece.search(line, pos)
+            if match is None:
+                return False
+            pos = match.end() if fixed_width else _earliest_end(piece, line, pos, match)
+        return last.search(line, pos) is not None
+
+    return matches
+
+
+def fuse_folded(patterns: Tuple[tuple, ...]) -> Pattern:
+    """Combine a table's patterns into one case-sensitive alternation over folded content.
+
+    The patterns must be ASCII, which fold_case matches like IGNORECASE. The result
+    matches wherever any of them could match a line (and possibly elsewhere), so it
+    only picks the candidate lines the patterns then check. Each pattern contributes
+    only its longest piece, which every line it matches contains; that keeps the
+    candidate search free of '.*' backtracking. Patterns that need a newline never
+    match a line and are left out.
+    """
+    alternatives = []
+    for pattern, *_ in patterns:
+        pieces = split_pieces(pattern.pattern)
+        if not pieces:
+            alternatives.append(f'(?:{lower_literals(pattern.pattern)})')
+        elif not any(map(needs_newline, pieces)):
+            longest = max(pieces, key=lambda piece: len(SOURCE_TOKEN_RE.findall(piece)))
+            alternatives.append(f'(?:{lower_literals(longest)})')
+    return re.compile('|'.join(alternatives) or r'(?!)')
@@ -0,0 +1,108 @@
+"""Multi-literal substring matching used to prefilter regex scans."""
+
+import re
+from typing import Dict, Iterable, Set
+
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator (pip install codeGuardian[fast])
+    ahocorasick = None
+
+
+def fold_case(text: str) -> str:
+    """Lowercase text the way re.IGNORECASE compares it against ASCII literals.
+
+    Besides A-Z, the regex engine treats four characters as equal to an ASCII
+    letter. KELVIN SIGN lowercases to 'k' by itself, but str.lower() leaves 'ı'
+    and 'ſ' alone and turns 'İ' into two characters. The result is exactly as
+    long as text, so offsets into one are offsets into the other.
+    """
+    if text.isascii():
+        return text.lower()
+    if '\u0130' in text:  # LATIN CAPITAL LETTER I WITH DOT ABOVE
+        text = text.replace('\u0130', 'i')
+    text = text.lower()
+    if '\u0131' in text:  # LATIN SMALL LETTER DOTLESS I
+        text = text.replace('\u0131', 'i')
+    if '\u017f' in text:  # LATIN SMALL LETTER LONG S
+        text = text.replace('\u017f', 's')
+    return text
+
+
+def lower_literals(source: str) -> str:
+    """Lowercase the letters of a regex source, leaving escapes alone (\\S is not \\s).
+
+    For an ASCII pattern, the result searched case-sensitively in fold_case(text)
+    matches where the original, with re.IGNORECASE, matches in text.
+    """
+    return re.sub(r'\\.|[A-Z]+', lambda match: match.group() if match.group()[0] == '\\'
+                  else match.group().lower(), source)
+
+
+class LiteralMatcher:
+    """Checks whether any of a fixed set of literals occurs in a text, ignoring case.
+
+    Uses a pyahocorasick automaton when it is installed and a single escaped regex
+    alternation otherwise; either way the text is scanned once, however many
+    literals there are.
+    """
+
+    def __init__(self, literals: Iterable[str]):
+        """Build the matcher for the given literals."""
+        self.literals = tuple(dict.fromkeys(literal.lower() for literal in literals))
+
+        # The automaton needs text folded exactly like re.IGNORECASE would, which
+        # fold_case only guarantees for ASCII literals
+        self._automaton = None
+        if ahocorasick is not None and self.literals and all(map(str.isascii, self.literals)):
+            self._automaton = ahocorasick.Automaton()
+            for literal in self.literals:
+                self._automaton.add_word(literal, literal)
+            self._automaton.make_automaton()
+
+        alternation = '|'.join(re.escape(literal) for literal in self.literals)
+        self._regex = re.compile(alternation or r'(?!)', re.IGNORECASE)
+
+    def search(self, text: str) -> bool:
+        """Check if any literal occurs in text."""
+        if self._automaton is not None:
+            for _ in self._automaton.iter(fold_case(text)):
+                return True
+            return False
+        return self._regex.search(text) is not None
+
+
+class LiteralGroups:
+    """Finds which of several named groups of literals occur in a text, ignoring case.
+
+    With pyahocorasick, one automaton over every group's literals scans the text
+    once, stopping as soon as all groups have been seen; otherwise each group's
+    LiteralMatcher searches the text in turn.
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        """Build the matchers for the given groups of literals."""
+        self.matchers = {name: LiteralMatcher(literals) for name, literals in groups.items()}
+
+        names_by_literal: Dict[str, Set[str]] = {}
+        for name, matcher in self.matchers.items():
+            for literal in matcher.literals:
+                names_by_literal.setdefault(literal, set()).add(name)
+
+        self._automaton = None
+        if ahocorasick is not None and names_by_literal and all(map(str.isascii, names_by_literal)):
+            self._automaton = ahocorasick.Automaton()
+            for literal, names in names_by_literal.items():
+                self._automaton.add_word(literal, frozenset(names))
+            self._automaton.make_automaton()
+
+    def present(self, text: str) -> Set[str]:
+        """Get the names of the groups with a literal that occurs in text."""
+        if self._automaton is None:
+            return {name for name, matcher in self.matchers.items() if matcher.search(text)}
+        found: Set[str] = set()
+        for _, names in self._automaton.iter(fold_case(text)):
+            found |= names
+            if len(found) == len(self.matchers):
+                break
+        return found
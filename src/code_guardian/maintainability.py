@@ -2,12 +2,122 @@
 
 import ast
 import re
-from typing import List, Tuple, Dict, Any
-from collections import defaultdict
+from typing import List, Tuple, Dict, Any, Optional
+from collections import Counter
+from functools import partial
 
+from .cache import ResultCache, relocate
 from .models import Issue
+from .parallel import run_pooled
+from .parsing import parse_python_cached
 from .config import Config
 
+# Line patterns checked by MaintainabilityScorer._analyze_patterns
+# A magic number is a standalone run of 2+ digits on a line whose comment (if
+# any) has no digits; used with fullmatch, as lines never contain a newline
+_MAGIC_NUMBER_RE = re.compile(r'[^#]*?\b\d{2,}\b[^#]*(?:#\D*)?')
+# Cheap screen for _MAGIC_NUMBER_RE, whose word boundary is tried at every position
+_DIGIT_PAIR_RE = re.compile(r'\d\d')
+_TODO_COMMENT_RE = re.compile(r'#.*\b(TODO|FIXME|HACK|XXX)\b', re.IGNORECASE)
+
+# Naming conventions checked by MaintainabilityASTVisitor (with fullmatch, as
+# identifiers never contain the newline a '$' anchor would also accept)
+_CLASS_NAME_RE = re.compile(r'[A-Z][a-zA-Z0-9]*')
+_FUNCTION_NAME_RE = re.compile(r'[a-z_][a-z0-9_]*')
+_CONSTANT_NAME_RE = re.compile(r'[A-Z][A-Z0-9_]*')
+
+# Minified bundles are not meant to be read, so they are not scored
+_MINIFIED_SUFFIXES = ('.min.js', '.min.css')
+
+# Files handed to a pool worker per task when scoring files in parallel
+_SCORE_CHUNK_SIZE = 16
+
+# Score deducted per issue of each severity, applied in this order
+_SEVERITY_PENALTIES = (('critical', 2), ('high', 1.5), ('medium', 1), ('low', 0.5))
+
+# Statements that each add one to a function's complexity
+_BRANCH_NODES = frozenset({ast.If, ast.For, ast.While, ast.Try, ast.With})
+
+# Issue templates, one per rule: only the message and location vary per issue
+_LINE_LENGTH_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.line_length',
+    suggestion='Break long lines into multiple lines for better readability.'
+)
+_TOO_MANY_PARAMS_LINE_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    message='Function has too many parameters',
+    rule_id='maintainability.too_many_params',
+    suggestion='Consider using a configuration object or breaking the function apart.'
+)
+_MAGIC_NUMBER_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    message='Magic number detected - consider using named constants',
+    rule_id='maintainability.magic_number',
+    suggestion='Replace magic numbers with named constants.'
+)
+_TODO_COMMENT_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    message='TODO/FIXME comment found',
+    rule_id='maintainability.todo_comment',
+    suggestion='Address TODO/FIXME comments before deployment.'
+)
+_DEEP_NESTING_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    message='Code is too deeply nested',
+    rule_id='maintainability.deep_nesting',
+    suggestion='Consider extracting nested code into separate functions.'
+)
+_CLASS_NAMING_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.class_naming',
+    suggestion='Use PascalCase for class names (e.g., MyClass).'
+)
+_TOO_MANY_METHODS_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    rule_id='maintainability.too_many_methods',
+    suggestion='Consider splitting the class or using composition.'
+)
+_CLASS_DOCSTRING_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.missing_docstring',
+    suggestion='Add a docstring to explain the class purpose.'
+)
+_FUNCTION_NAMING_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.function_naming',
+    suggestion='Use snake_case for function names (e.g., my_function).'
+)
+_LONG_FUNCTION_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    rule_id='maintainability.long_function',
+    suggestion='Break long functions into smaller, focused functions.'
+)
+_TOO_MANY_PARAMS_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    rule_id='maintainability.too_many_params',
+    suggestion='Consider using a configuration object or reducing parameters.'
+)
+_FUNCTION_DOCSTRING_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.missing_docstring',
+    suggestion='Add a docstring to explain the function purpose and parameters.'
+)
+_HIGH_COMPLEXITY_ISSUE = partial(
+    Issue, severity='medium', category='maintainability',
+    rule_id='maintainability.high_complexity',
+    suggestion='Simplify the function by extracting complex logic into helper functions.'
+)
+_SHORT_VARIABLE_NAME_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.short_variable_name',
+    suggestion='Use descriptive variable names instead of single letters.'
+)
+_CONSTANT_NAMING_ISSUE = partial(
+    Issue, severity='low', category='maintainability',
+    rule_id='maintainability.constant_naming'
+)
+
 
 class MaintainabilityScorer:
     """Analyzes code maintainability and readability."""
@@ -18,115 +128,150 @@ class MaintainabilityScorer:
         self.max_complexity = config.get('maintainability.max_complexity', 10)
         self.max_function_length = config.get('maintainability.max_function_length', 50)
         self.max_class_methods = config.get('maintainability.max_class_methods', 20)
+        self.max_file_size = config.get('maintainability.max_file_size', 1_048_576)
+
+        # Results of score_files() across runs, opened on its first call (CodeAnalyzer,
+        # which only calls score_file, caches whole files itself)
+        self.result_cache: Optional[ResultCache] = None
+        self._config_key = repr((self.max_complexity, self.max_function_length, self.max_class_methods,
+                                 self.max_file_size))
 
-    def score_file(self, file_path: str, content: str) -> Tuple[List[Issue], float]:
+    def score_file(self, file_path: str, content: str, tree: Optional[ast.AST] = None,
+                   lines: Optional[List[str]] = None) -> Tuple[List[Issue], float]:
         """Score a file for maintainability and return issues + score."""
-        issues = []
+        # Minified and very large (usually generated or vendored) files are not scored
+        if len(content) > self.max_file_size or file_path.endswith(_MINIFIED_SUFFIXES):
+            return [], 10.0
+
         base_score = 10.0
+        if lines is None:
+            lines = content.splitlines()
 
-        # Pattern-based analysis
-        pattern_issues = self._analyze_patterns(file_path, content)
-        issues.extend(pattern_issues)
+        # Pattern-based analysis (its list collects all the issues; nothing else holds it)
+        issues = self._analyze_patterns(file_path, lines)
 
         # AST-based analysis for Python files
         if file_path.endswith('.py'):
-            ast_issues, structural_score = self._analyze_python_structure(file_path, content)
-            issues.extend(ast_issues)
+            ast_issues, structural_score = self._analyze_python_structure(file_path, content, tree)
             base_score = min(base_score, structural_score)
 
+            # A long parameter list is flagged by both the line heuristics and the AST;
+            # only the AST issue, which gives the parameter count, is kept
+            counted = {issue.line_number for issue in ast_issues
+                       if issue.rule_id == 'maintainability.too_many_params'}
+            if counted:
+                issues = [issue for issue in issues
+                          if issue.rule_id != 'maintainability.too_many_params' or issue.line_number not in counted]
+            issues.extend(ast_issues)
+
+            # Exact repeats (e.g. 'a, a = ...') are reported, and penalized, once
+            seen = set()
+            issues = [
+                issue for issue in issues
+                if (key := (issue.rule_id, issue.line_number, issue.message)) not in seen and not seen.add(key)
+            ]
+
         # Calculate final score based on issues
+        severity_counts = Counter(issue.severity for issue in issues)
         final_score = base_score
-        final_score -= len([i for i in issues if i.severity == 'critical']) * 2
-        final_score -= len([i for i in issues if i.severity == 'high']) * 1.5
-        final_score -= len([i for i in issues if i.severity == 'medium']) * 1
-        final_score -= len([i for i in issues if i.severity == 'low']) * 0.5
+        for severity, penalty in _SEVERITY_PENALTIES:
+            final_score -= severity_counts[severity] * penalty
 
         return issues, max(0.0, final_score)
 
-    def _analyze_patterns(self, file_path: str, content: str) -> List[Issue]:
+    def score_files(self, file_items: List[Tuple[str, str]]) -> List[Tuple[List[Issue], float]]:
+        """Score (file_path, content) pairs, across a process pool when parallelism is enabled.
+
+        Results come back in input order. Files whose content was scored before with
+        the same settings are served from the result cache.
+        """
+        if self.result_cache is None and self.config.cache_enabled:
+            self.result_cache = ResultCache(self.config.cache_directory)
+
+        results: List[Optional[Tuple[List[Issue], float]]] = [None] * len(file_items)
+        cache_keys = []
+        if self.result_cache:
+            for index, (file_path, content) in enumerate(file_items):
+                cache_key = self.result_cache.key_for(file_path, content, self._config_key, 'maintainability')
+                cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    results[index] = relocate(cached, file_path)
+                cache_keys.append(cache_key)
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        scored = self._score_files_uncached([file_items[index] for index in pending])
+        for index, result in zip(pending, scored):
+            results[index] = result
+            if self.result_cache:
+                self.result_cache.put(cache_keys[index], result)
+        return results
+
+    def _score_files_uncached(self, file_items: List[Tuple[str, str]]) -> List[Tuple[List[Issue], float]]:
+        """Score files across a process pool, falling back to this process if workers are unavailable."""
+        return run_pooled(MaintainabilityScorer, 'score_file', file_items, self.config, _SCORE_CHUNK_SIZE,
+                          local=self)
+
+    def _analyze_patterns(self, file_path: str, lines: List[str]) -> List[Issue]:
         """Analyze code patterns that affect maintainability."""
         issues = []
-        lines = content.splitlines()
 
         # Check for code smells
         for line_num, line in enumerate(lines, 1):
+            has_def = 'def ' in line
+
             # Long lines
             if len(line) > 120:
-                issues.append(Issue(
-                    severity='low',
-                    category='maintainability',
+                issues.append(_LINE_LENGTH_ISSUE(
                     message=f'Line too long ({len(line)} characters)',
                     file_path=file_path,
-                    line_number=line_num,
-                    rule_id='maintainability.line_length',
-                    suggestion='Break long lines into multiple lines for better readability.'
+                    line_number=line_num
                 ))
 
             # Too many parameters (simple heuristic)
-            if 'def ' in line and line.count(',') > 5:
-                issues.append(Issue(
-                    severity='medium',
-                    category='maintainability',
-                    message='Function has too many parameters',
+            if has_def and line.count(',') > 5:
+                issues.append(_TOO_MANY_PARAMS_LINE_ISSUE(
+                    file_path=file_path,
+                    line_number=line_num
+                ))
+
+            # Magic numbers (skipped if the line's comment has digits too)
+            if not has_def and _DIGIT_PAIR_RE.search(line) and _MAGIC_NUMBER_RE.fullmatch(line):
+                issues.append(_MAGIC_NUMBER_ISSUE(
                     file_path=file_path,
-                    line_number=line_num,
-                    rule_id='maintainability.too_many_params',
-                    suggestion='Consider using a configuration object or breaking the function apart.'
+                    line_number=line_num
                 ))
 
-            # Magic numbers
-            magic_number_pattern = r'\b\d{2,}\b'
-            if re.search(magic_number_pattern, line) and 'def ' not in line:
-                if not re.search(r'#.*\d+', line):  # Skip if commented
-                    issues.append(Issue(
-                        severity='low',
-                        category='maintainability',
-                        message='Magic number detected - consider using named constants',
-                        file_path=file_path,
-                        line_number=line_num,
-                        rule_id='maintainability.magic_number',
-                        suggestion='Replace magic numbers with named constants.'
-                    ))
-
-            # TODO/FIXME comments
-            if re.search(r'#.*\b(TODO|FIXME|HACK|XXX)\b', line, re.IGNORECASE):
-                issues.append(Issue(
-                    severity='low',
-                    category='maintainability',
-                    message='TODO/FIXME comment found',
+            # TODO/FIXME comments (the pattern needs a '#', so other lines skip it)
+            if '#' in line and _TODO_COMMENT_RE.search(line):
+                issues.append(_TODO_COMMENT_ISSUE(
                     file_path=file_path,
-                    line_number=line_num,
-                    rule_id='maintainability.todo_comment',
-                    suggestion='Address TODO/FIXME comments before deployment.'
+                    line_number=line_num
                 ))
 
-            # Deeply nested code (simple heuristic)
-            leading_whitespace = len(line) - len(line.lstrip())
-            if leading_whitespace > 24:  # More than 6 levels of indentation
-                issues.append(Issue(
-                    severity='medium',
-                    category='maintainability',
-                    message='Code is too deeply nested',
+            # Deeply nested code (simple heuristic): more than 24 leading whitespace
+            # characters, checked on a 25-character slice instead of an lstrip() copy
+            if len(line) > 24 and line[:25].isspace():  # More than 6 levels of indentation
+                issues.append(_DEEP_NESTING_ISSUE(
                     file_path=file_path,
-                    line_number=line_num,
-                    rule_id='maintainability.deep_nesting',
-                    suggestion='Consider extracting nested code into separate functions.'
+                    line_number=line_num
                 ))
 
         return issues
 
-    def _analyze_python_structure(self, file_path: str, content: str) -> Tuple[List[Issue], float]:
+    def _analyze_python_structure(self, file_path: str, content: str,
+                                  tree: Optional[ast.AST] = None) -> Tuple[List[Issue], float]:
         """Analyze Python code structure using AST."""
         issues = []
         structural_score = 10.0
 
         try:
-            tree = ast.parse(content)
+            if tree is None:
+                tree = parse_python_cached(content, file_path)
             visitor = MaintainabilityASTVisitor(
                 file_path, self.max_complexity, self.max_function_length, self.max_class_methods
             )
             visitor.visit(tree)
-            issues.extend(visitor.issues)
+            issues = visitor.issues
             structural_score = visitor.get_structural_score()
         except SyntaxError:
             issues.append(Issue(
@@ -162,13 +307,12 @@ class MaintainabilityASTVisitor(ast.NodeVisitor):
         self.max_class_methods = max_class_methods
         self.issues = []
 
-        # Metrics tracking
-        self.function_lengths = []
-        self.function_complexities = []
-        self.class_method_counts = []
-        self.variable_names = []
-        self.function_names = []
-        self.class_names = []
+        # Metrics tracking (running totals; the structural score only needs averages)
+        self.function_count = 0
+        self.total_function_length = 0
+        self.total_complexity = 0
+        self.class_count = 0
+        self.total_class_methods = 0
 
         # Current context
         self.current_complexity = 0
@@ -177,44 +321,31 @@ class MaintainabilityASTVisitor(ast.NodeVisitor):
     def visit_ClassDef(self, node):
         """Visit class definitions."""
         # Check naming convention
-        if not re.match(r'^[A-Z][a-zA-Z0-9]*$', node.name):
-            self.issues.append(Issue(
-                severity='low',
-                category='maintainability',
+        if not _CLASS_NAME_RE.fullmatch(node.name):
+            self.issues.append(_CLASS_NAMING_ISSUE(
                 message=f'Class name "{node.name}" doesn\'t follow PascalCase convention',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.class_naming',
-                suggestion='Use PascalCase for class names (e.g., MyClass).'
+                line_number=node.lineno
             ))
 
-        self.class_names.append(node.name)
-
         # Count methods in class
         method_count = len([n for n in node.body if isinstance(n, ast.FunctionDef)])
         if method_count > self.max_class_methods:
-            self.issues.append(Issue(
-                severity='medium',
-                category='maintainability',
+            self.issues.append(_TOO_MANY_METHODS_ISSUE(
                 message=f'Class has too many methods ({method_count})',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.too_many_methods',
-                suggestion='Consider splitting the class or using composition.'
+                line_number=node.lineno
             ))
 
-        self.class_method_counts.append(method_count)
+        self.class_count += 1
+        self.total_class_methods += method_count
 
         # Check for missing docstring
         if not ast.get_docstring(node):
-            self.issues.append(Issue(
-                severity='low',
-                category='maintainability',
+            self.issues.append(_CLASS_DOCSTRING_ISSUE(
                 message=f'Class "{node.name}" missing docstring',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.missing_docstring',
-                suggestion='Add a docstring to explain the class purpose.'
+                line_number=node.lineno
             ))
 
         self.generic_visit(node)
@@ -222,160 +353,169 @@ class MaintainabilityASTVisitor(ast.NodeVisitor):
     def visit_FunctionDef(self, node):
         """Visit function definitions."""
         # Check naming convention
-        if not re.match(r'^[a-z_][a-z0-9_]*$', node.name) and not node.name.startswith('__'):
-            self.issues.append(Issue(
-                severity='low',
-                category='maintainability',
+        if not _FUNCTION_NAME_RE.fullmatch(node.name) and not node.name.startswith('__'):
+            self.issues.append(_FUNCTION_NAMING_ISSUE(
                 message=f'Function name "{node.name}" doesn\'t follow snake_case convention',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.function_naming',
-                suggestion='Use snake_case for function names (e.g., my_function).'
+                line_number=node.lineno
             ))
 
-        self.function_names.append(node.name)
-
         # Check function length
         function_end = node.end_lineno if hasattr(node, 'end_lineno') else node.lineno + 10
         function_length = function_end - node.lineno
         if function_length > self.max_function_length:
-            self.issues.append(Issue(
-                severity='medium',
-                category='maintainability',
+            self.issues.append(_LONG_FUNCTION_ISSUE(
                 message=f'Function is too long ({function_length} lines)',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.long_function',
-                suggestion='Break long functions into smaller, focused functions.'
+                line_number=node.lineno
             ))
 
-        self.function_lengths.append(function_length)
+        self.function_count += 1
+        self.total_function_length += function_length
 
         # Check parameter count
         param_count = len(node.args.args)
         if param_count > 5:
-            self.issues.append(Issue(
-                severity='medium',
-                category='maintainability',
+            self.issues.append(_TOO_MANY_PARAMS_ISSUE(
                 message=f'Function has too many parameters ({param_count})',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.too_many_params',
-                suggestion='Consider using a configuration object or reducing parameters.'
+                line_number=node.lineno
             ))
 
         # Check for missing docstring (except for very short functions)
         if function_length > 5 and not ast.get_docstring(node) and not node.name.startswith('_'):
-            self.issues.append(Issue(
-                severity='low',
-                category='maintainability',
+            self.issues.append(_FUNCTION_DOCSTRING_ISSUE(
                 message=f'Function "{node.name}" missing docstring',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.missing_docstring',
-                suggestion='Add a docstring to explain the function purpose and parameters.'
+                line_number=node.lineno
             ))
 
-        # Analyze complexity
+        # Analyze complexity; the parameter list is walked by hand, as only its
+        # defaults and annotations can hold anything the visitor checks
         old_complexity = self.current_complexity
         self.current_complexity = 1
-        self.generic_visit(node)
+        self._visit_arguments(node.args)
+        visit = self.visit
+        for child in node.body:
+            visit(child)
+        for child in node.decorator_list:
+            visit(child)
+        if node.returns is not None:
+            visit(node.returns)
+        for child in getattr(node, 'type_params', ()):  # Python 3.12+
+            visit(child)
 
         if self.current_complexity > self.max_complexity:
-            self.issues.append(Issue(
-                severity='medium',
-                category='maintainability',
+            self.issues.append(_HIGH_COMPLEXITY_ISSUE(
                 message=f'Function complexity ({self.current_complexity}) is too high',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='maintainability.high_complexity',
-                suggestion='Simplify the function by extracting complex logic into helper functions.'
+                line_number=node.lineno
             ))
 
-        self.function_complexities.append(self.current_complexity)
+        self.total_complexity += self.current_complexity
         self.current_complexity = old_complexity
 
-    def visit_Name(self, node):
-        """Visit variable names to check naming conventions."""
-        if isinstance(node.ctx, ast.Store):  # Variable assignment
-            name = node.id
-            if len(name) == 1 and name not in ['i', 'j', 'k', 'x', 'y', 'z']:
-                self.issues.append(Issue(
-                    severity='low',
-                    category='maintainability',
-                    message=f'Single-letter variable name "{name}" is not descriptive',
+    def _visit_arguments(self, node):
+        """Visit the expressions of a parameter list, skipping the arguments and arg nodes themselves."""
+        visit = self.visit
+        for arg in node.posonlyargs + node.args:
+            if arg.annotation is not None:
+                visit(arg.annotation)
+        if node.vararg is not None and node.vararg.annotation is not None:
+            visit(node.vararg.annotation)
+        for arg in node.kwonlyargs:
+            if arg.annotation is not None:
+                visit(arg.annotation)
+        for default in node.kw_defaults:
+            if default is not None:
+                visit(default)
+        if node.kwarg is not None and node.kwarg.annotation is not None:
+            visit(node.kwarg.annotation)
+        for default in node.defaults:
+            visit(default)
+
+    def _check_variable_name(self, node):
+        """Check the naming conventions of a variable being assigned."""
+        name = node.id
+        if len(name) == 1 and name not in ['i', 'j', 'k', 'x', 'y', 'z']:
+            self.issues.append(_SHORT_VARIABLE_NAME_ISSUE(
+                message=f'Single-letter variable name "{name}" is not descriptive',
+                file_path=self.file_path,
+                line_number=node.lineno
+            ))
+
+        # Check for non-conventional naming
+        if _CONSTANT_NAME_RE.fullmatch(name):  # ALL_CAPS
+            if not name.isupper() or '_' not in name:
+                self.issues.append(_CONSTANT_NAMING_ISSUE(
+                    message=f'Constant "{name}" should use UPPER_CASE convention',
                     file_path=self.file_path,
-                    line_number=node.lineno,
-                    rule_id='maintainability.short_variable_name',
-                    suggestion='Use descriptive variable names instead of single letters.'
+                    line_number=node.lineno
                 ))
 
-            # Check for non-conventional naming
-            if re.match(r'^[A-Z][A-Z0-9_]*$', name):  # ALL_CAPS
-                if not name.isupper() or '_' not in name:
-                    self.issues.append(Issue(
-                        severity='low',
-                        category='maintainability',
-                        message=f'Constant "{name}" should use UPPER_CASE convention',
-                        file_path=self.file_path,
-                        line_number=node.lineno,
-                        rule_id='maintainability.constant_naming'
-                    ))
-
-            self.variable_names.append(name)
-
-        self.generic_visit(node)
-
-    def visit_If(self, node):
-        """Visit if statements for complexity."""
-        self.current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_For(self, node):
-        """Visit for loops for complexity."""
-        self.current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_While(self, node):
-        """Visit while loops for complexity."""
-        self.current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_Try(self, node):
-        """Visit try statements for complexity."""
-        self.current_complexity += 1
-        self.generic_visit(node)
-
-    def visit_With(self, node):
-        """Visit with statements for complexity."""
-        self.current_complexity += 1
-        self.generic_visit(node)
-
     def visit_BoolOp(self, node):
         """Visit boolean operations for complexity."""
         self.current_complexity += len(node.values) - 1
         self.generic_visit(node)
 
+    # Handlers by exact node type; NodeVisitor.visit would look them up by name
+    _handlers = {
+        ast.ClassDef: visit_ClassDef,
+        ast.FunctionDef: visit_FunctionDef,
+        ast.BoolOp: visit_BoolOp,
+    }
+
+    def visit(self, node):
+        """Visit a node: count its complexity, then run its handler or visit its children."""
+        node_type = type(node)
+        if node_type is ast.Name:
+            # Names are leaves; only assigned ones (a small minority) are checked
+            if type(node.ctx) is ast.Store:
+                self._check_variable_name(node)
+            return
+        if node_type in _BRANCH_NODES:
+            self.current_complexity += 1
+
+        handler = self._handlers.get(node_type)
+        if handler is not None:
+            handler(self, node)
+        else:
+            self.generic_visit(node)
+
+    def generic_visit(self, node):
+        """Visit the children of a node, skipping Load/Store/Del context leaves."""
+        # Inlined ast.iter_child_nodes: the generator dominated visiting time
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                visit(value)
+
     def get_structural_score(self) -> float:
         """Calculate structural score based on metrics."""
         score = 10.0
 
         # Function length penalty
-        if self.function_lengths:
-            avg_length = sum(self.function_lengths) / len(self.function_lengths)
+        if self.function_count:
+            avg_length = self.total_function_length / self.function_count
             if avg_length > self.max_function_length:
                 score -= (avg_length - self.max_function_length) * 0.1
 
         # Complexity penalty
-        if self.function_complexities:
-            avg_complexity = sum(self.function_complexities) / len(self.function_complexities)
+        if self.function_count:
+            avg_complexity = self.total_complexity / self.function_count
             if avg_complexity > self.max_complexity:
                 score -= (avg_complexity - self.max_complexity) * 0.2
 
         # Class size penalty
-        if self.class_method_counts:
-            avg_methods = sum(self.class_method_counts) / len(self.class_method_counts)
+        if self.class_count:
+            avg_methods = self.total_class_methods / self.class_count
             if avg_methods > self.max_class_methods:
                 score -= (avg_methods - self.max_class_methods) * 0.1
 
-        return max(0.0, score)
\ No newline at end of file
+        return max(0.0, score)
+
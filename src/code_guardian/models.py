@@ -1,10 +1,25 @@
 """Data models for Code Guardian."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+import operator
+import sys
 
+# Severity names ordered by rank; comparisons should use the integer levels
+SEVERITY_NAMES = ('low', 'medium', 'high', 'critical')
+SEVERITY_LEVELS = {name: level for level, name in enumerate(SEVERITY_NAMES)}
 
-@dataclass
+# Scans create issues by the thousand; __slots__ (generated by dataclass on
+# Python 3.10+) drop their per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern(value: Any) -> Any:
+    """Intern exact str values; anything else is returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(**_SLOTS)
 class Issue:
     """Represents a code quality issue."""
     severity: str
@@ -18,8 +33,15 @@ class Issue:
     source_snippet: str = ""
     suggestion: str = ""
 
+    def __post_init__(self):
+        """Intern the fields that repeat across many issues so they share one string."""
+        self.severity = _intern(self.severity)
+        self.category = _intern(self.category)
+        self.file_path = _intern(self.file_path)
+        self.rule_id = _intern(self.rule_id)
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResults:
     """Container for analysis results."""
     files_scanned: int = 0
@@ -30,15 +52,54 @@ class AnalysisResults:
     issues: List[Issue] = field(default_factory=list)
     file_scores: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     execution_time: float = 0.0
+    cache_stats: Dict[str, int] = field(default_factory=dict)
+
+    # Issues grouped by severity and category, built on first lookup. The indexed
+    # issues are remembered, so the indexes are rebuilt whenever issues changes in
+    # any way (replaced, grown, or edited in place) other than through add_issue()
+    _indexed_issues: Optional[List[Issue]] = field(default=None, init=False, repr=False, compare=False)
+    _by_severity: Dict[str, List[Issue]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_category: Dict[str, List[Issue]] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def _index_is_current(self) -> bool:
+        """Check if the indexes cover exactly the issues currently in the list."""
+        indexed = self._indexed_issues
+        return (indexed is not None and len(indexed) == len(self.issues)
+                and all(map(operator.is_, indexed, self.issues)))
+
+    def _ensure_indexed(self) -> None:
+        """Group the issues by severity and category unless the indexes are current."""
+        if self._index_is_current():
+            return
+        by_severity: Dict[str, List[Issue]] = {}
+        by_category: Dict[str, List[Issue]] = {}
+        for issue in self.issues:
+            by_severity.setdefault(issue.severity, []).append(issue)
+            by_category.setdefault(issue.category, []).append(issue)
+        self._by_severity = by_severity
+        self._by_category = by_category
+        self._indexed_issues = list(self.issues)
+
+    def add_issue(self, issue: Issue) -> None:
+        """Add an issue, updating the indexes in place if they are built."""
+        indexed = self._index_is_current()
+        self.issues.append(issue)
+        if indexed:
+            self._by_severity.setdefault(issue.severity, []).append(issue)
+            self._by_category.setdefault(issue.category, []).append(issue)
+            self._indexed_issues.append(issue)
 
     def has_critical_issues(self) -> bool:
         """Check if there are any critical issues."""
-        return any(issue.severity == 'critical' for issue in self.issues)
+        self._ensure_indexed()
+        return 'critical' in self._by_severity
 
     def get_issues_by_severity(self, severity: str) -> List[Issue]:
         """Get issues filtered by severity."""
-        return [issue for issue in self.issues if issue.severity == severity]
+        self._ensure_indexed()
+        return list(self._by_severity.get(severity, ()))
 
     def get_issues_by_category(self, category: str) -> List[Issue]:
         """Get issues filtered by category."""
-        return [issue for issue in self.issues if issue.category == category]
\ No newline at end of file
+        self._ensure_indexed()
+        return list(self._by_category.get(category, ()))
@@ -0,0 +1,45 @@
+"""Process pools that run an analyzer method over many items."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, List, Sequence
+
+from .config import Config
+
+# Object of a pool worker process, built once by _init_worker
+_worker: Any = None
+
+
+def run_pooled(factory: Callable[[Config], Any], method: str, items: Sequence[tuple], config: Config,
+               chunksize: int, local: Any = None) -> List[Any]:
+    """Call method(*item) for each item, across a process pool when parallelism is enabled.
+
+    Each worker builds its object once with factory(config), so patterns are compiled
+    once per process rather than once per item. Results come back in input order; if
+    worker processes are unavailable the items run in this process instead, on local
+    (or a new factory(config) object).
+    """
+    max_workers = config.parallel_max_workers or os.cpu_count() or 1
+    workers = min(max_workers, -(-len(items) // chunksize))
+    if config.parallel_enabled and workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(factory, config.to_dict())) as executor:
+                return list(executor.map(partial(_run_item, method), items, chunksize=chunksize))
+        except (OSError, NotImplementedError, BrokenProcessPool):
+            pass
+    run = getattr(factory(config) if local is None else local, method)
+    return [run(*item) for item in items]
+
+
+def _init_worker(factory: Callable[[Config], Any], config_dict: Dict[str, Any]) -> None:
+    """Pool initializer: build the worker's object (and compile its patterns) once."""
+    global _worker
+    _worker = factory(Config(config_dict))
+
+
+def _run_item(method: str, item: tuple) -> Any:
+    """Worker entry point: call the worker object's method on one item."""
+    return getattr(_worker, method)(*item)
@@ -0,0 +1,26 @@
+"""Python source parsing shared by the analyzers."""
+
+import ast
+from functools import lru_cache
+from typing import Union
+
+
+def parse_python(source: Union[str, bytes], filename: str = '<unknown>') -> ast.Module:
+    """Parse Python source into an AST.
+
+    Calls compile() directly with PyCF_ONLY_AST, so no code object is built and
+    no __future__ flags or type comments are picked up. Raises SyntaxError (or
+    ValueError for null bytes on older Pythons) like ast.parse.
+    """
+    return compile(source, filename, 'exec', ast.PyCF_ONLY_AST, dont_inherit=True)
+
+
+@lru_cache(maxsize=16)
+def parse_python_cached(source: str, filename: str = '<unknown>') -> ast.Module:
+    """Parse Python source, reusing the tree of a recent parse of the same source.
+
+    For analyzers called without a pre-parsed tree: when several of them analyze
+    the same file in turn, only the first one parses it. The trees are shared, so
+    callers must not modify them. Parse errors are raised again on every call.
+    """
+    return parse_python(source, filename)
@@ -2,13 +2,221 @@
 
 import ast
 import re
-from typing import List, Tuple, Dict, Any
+from bisect import bisect_right
+from collections import Counter
+from functools import cache, partial
+from typing import Callable, Iterator, List, Tuple, Dict, Any, Optional, Pattern
 from pathlib import Path
 
+from .linematch import (SINGLE_CHAR_TOKEN_RE, SOURCE_TOKEN_RE, fuse_folded, line_matcher,
+                        needs_newline, split_pieces)
+from .literals import ahocorasick
 from .models import Issue
+from .parallel import run_pooled
+from .parsing import parse_python_cached
+from .source import SourceLines
 from .config import Config
 
 
+# Suggestions keyed by a phrase of the issue description, checked in order
+_SUGGESTIONS = {
+    'inefficient loop': 'Use enumerate() or iterate directly over the collection.',
+    'list comprehension': 'Consider using list comprehension for better performance.',
+    'concatenation': 'Use join() for string concatenation or extend() for lists.',
+    'database queries': 'Use batch operations or bulk inserts instead of individual queries.',
+    'http requests': 'Use session objects to reuse connections.',
+    'dom queries': 'Cache DOM elements outside of loops.',
+    'memory inefficiency': 'Consider using generators or processing data in chunks.',
+}
+
+
+@cache
+def _performance_suggestion(description: str) -> str:
+    """Get the improvement suggestion for an issue description."""
+    description = description.lower()
+    for key, suggestion in _SUGGESTIONS.items():
+        if key in description:
+            return suggestion
+
+    return 'Review this code for potential performance improvements.'
+
+
+def _compile_patterns(patterns: List[Tuple[str, str, str]]) -> Tuple[Tuple[Pattern, str, str, str], ...]:
+    """Compile (pattern, description, severity) rows, resolving each row's suggestion once."""
+    return tuple(
+        (re.compile(pattern, re.IGNORECASE), description, severity, _performance_suggestion(description))
+        for pattern, description, severity in patterns
+    )
+
+
+# Inefficient loop patterns
+_INEFFICIENT_PATTERNS = _compile_patterns([
+    (r'for.*in.*range\(len\(', 'Inefficient loop - use enumerate() or direct iteration', 'medium'),
+    (r'while.*len\(.*\)\s*>', 'Inefficient while loop checking length', 'medium'),
+    (r'\.append\(.*\)\s*\n.*for.*in', 'List comprehension may be more efficient', 'low'),
+    (r'list\(filter\(.*list\(map\(', 'Nested list comprehension may be more efficient', 'medium'),
+])
+
+# Memory usage patterns
+_MEMORY_PATTERNS = _compile_patterns([
+    (r'.*\+=.*\[.*\]', 'Potential memory inefficiency with list concatenation', 'medium'),
+    (r'.*\.copy\(\).*in.*loop', 'Copying in loop can cause memory issues', 'high'),
+    (r'pd\.concat.*in.*for', 'Inefficient pandas concatenation in loop', 'high'),
+    (r'np\.concatenate.*for.*in', 'Inefficient numpy concatenation in loop', 'medium'),
+])
+
+# Database/IO patterns
+_IO_PATTERNS = _compile_patterns([
+    (r'\.execute\(.*for.*in', 'Database queries in loop - consider batch operations', 'high'),
+    (r'open\(.*for.*in', 'File operations in loop can be inefficient', 'medium'),
+    (r'requests\.get\(.*for', 'HTTP requests in loop without session reuse', 'high'),
+    (r'time\.sleep\(.*for', 'Sleep in loop may indicate inefficient design', 'low'),
+])
+
+_ALL_PATTERNS = _INEFFICIENT_PATTERNS + _MEMORY_PATTERNS + _IO_PATTERNS
+
+# Files handed to a pool worker per task when analyzing a batch
+_ANALYZE_CHUNK_SIZE = 16
+
+# Score deducted per issue of each severity (low costs nothing), applied in this order
+_SEVERITY_PENALTIES = (('critical', 3), ('high', 2), ('medium', 1))
+
+# Issue templates, one per rule: only the message and location vary per issue
+_PATTERN_ISSUE = partial(Issue, category='performance', rule_id='performance.pattern')
+_JAVASCRIPT_ISSUE = partial(Issue, category='performance', rule_id='performance.javascript')
+_COMPLEXITY_ISSUE = partial(
+    Issue, category='performance',
+    rule_id='performance.complexity',
+    suggestion='Consider breaking this function into smaller functions.'
+)
+_NESTED_LOOPS_ISSUE = partial(
+    Issue, severity='medium', category='performance',
+    rule_id='performance.nested_loops',
+    suggestion='Consider flattening the loop structure or using more efficient algorithms.'
+)
+_RANGE_LEN_ISSUE = partial(
+    Issue, severity='low', category='performance',
+    message='Use enumerate() or direct iteration instead of range(len())',
+    rule_id='performance.range_len',
+    suggestion='Use "for i, item in enumerate(collection)" or "for item in collection".'
+)
+_NESTED_COMPREHENSION_ISSUE = partial(
+    Issue, severity='medium', category='performance',
+    message='Nested list comprehensions can be hard to read and maintain',
+    rule_id='performance.nested_comprehension',
+    suggestion='Consider breaking into separate comprehensions or using traditional loops.'
+)
+_APPEND_IN_LOOP_ISSUE = partial(
+    Issue, severity='low', category='performance',
+    message='List.append() in nested loop may be inefficient',
+    rule_id='performance.append_in_loop',
+    suggestion='Consider using list comprehension or preallocating the list.'
+)
+
+# JavaScript/TypeScript patterns (JavaScript issues carry no suggestion)
+_JS_PATTERNS = tuple(
+    (re.compile(pattern, re.IGNORECASE), description, severity)
+    for pattern, description, severity in [
+        (r'document\.getElementById.*in.*for', 'DOM queries in loop are inefficient', 'high'),
+        (r'\.innerHTML\s*\+=', 'innerHTML concatenation causes reflow', 'medium'),
+        (r'new.*RegExp.*in.*for', 'RegExp creation in loop is inefficient', 'medium'),
+        (r'JSON\.parse.*JSON\.stringify', 'Deep clone via JSON is inefficient', 'medium'),
+        (r'addEventListener.*in.*for', 'Event listeners in loop without cleanup', 'high'),
+    ]
+)
+
+
+def _anchor(pieces: List[str]) -> str:
+    """Get the longest run of literal characters in a pattern's pieces, lowercased.
+
+    Every line the pattern matches contains the anchor (ignoring case). Returns an
+    empty string when no piece has a literal character.
+    """
+    runs = []
+    for piece in pieces:
+        run = ''
+        for token in SOURCE_TOKEN_RE.findall(piece):
+            if token[0] == '\\' and not token[1:].isalnum():
+                run += token[1:]  # An escaped punctuation character
+            elif SINGLE_CHAR_TOKEN_RE.fullmatch(token) and token[0] not in '\\.[':
+                run += token
+            else:
+                if token in ('*', '?') or token.startswith('{'):
+                    run = run[:-1]  # The quantified character may be absent
+                runs.append(run)
+                run = ''
+        runs.append(run)
+    return max(runs, key=len).lower()
+
+
+def _anchor_automaton(patterns: Tuple[tuple, ...]) -> Optional[Any]:
+    """Build a pyahocorasick automaton over the rows' anchors, reporting each row's index.
+
+    Rows whose pattern needs a newline never match a line and are left out. Returns
+    None when pyahocorasick is not installed or a row has no ASCII anchor, in which
+    case the fused candidate regex screens the lines instead.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    anchors = {}
+    for index, (pattern, *_) in enumerate(patterns):
+        pieces = split_pieces(pattern.pattern)
+        if pieces is None or not pieces:
+            return None
+        if any(map(needs_newline, pieces)):
+            continue
+        anchor = _anchor(pieces)
+        if not anchor or not anchor.isascii():
+            return None
+        anchors.setdefault(anchor, []).append(index)
+    if not anchors:
+        return None
+    for anchor, indexes in anchors.items():
+        automaton.add_word(anchor, tuple(indexes))
+    automaton.make_automaton()
+    return automaton
+
+
+_ALL_CANDIDATES_RE = fuse_folded(_ALL_PATTERNS)
+_JS_CANDIDATES_RE = fuse_folded(_JS_PATTERNS)
+_ALL_ANCHORS = _anchor_automaton(_ALL_PATTERNS)
+_JS_ANCHORS = _anchor_automaton(_JS_PATTERNS)
+_ALL_LINE_MATCHERS = tuple(line_matcher(row[0]) for row in _ALL_PATTERNS)
+_JS_LINE_MATCHERS = tuple(line_matcher(row[0]) for row in _JS_PATTERNS)
+
+
+def _matching_rows(source: SourceLines, rows: Tuple[tuple, ...], matchers: Tuple[Callable[[str], Any], ...],
+                   candidates: Pattern, anchors: Optional[Any] = None) -> Iterator[Tuple[int, tuple, str]]:
+    """Yield each (line_number, row, line) where a row's pattern matches a line, in line order.
+
+    With an anchor automaton, one pass over the folded content finds the lines
+    holding each row's anchor, and only those rows are checked on those lines.
+    Otherwise the fused candidate regex finds the lines any row could match and
+    every row is checked on them. Either way each row's line matcher checks a
+    line alone, exactly as a per-line scan with the row's pattern would.
+    """
+    if anchors is None:
+        for line_num, line in source.matching_lines(candidates, source.folded):
+            for row, matches in zip(rows, matchers):
+                if matches(line):
+                    yield line_num, row, line
+        return
+
+    # Anchors hold no line breaks, so the end of a hit lies on the anchor's line
+    starts, lines = source.starts, source.lines
+    rows_by_line: Dict[int, set] = {}
+    for end, indexes in anchors.iter(source.folded):
+        rows_by_line.setdefault(bisect_right(starts, end) - 1, set()).update(indexes)
+    for index in sorted(rows_by_line):
+        if index >= len(lines):
+            continue
+        line = lines[index]
+        for row_index in sorted(rows_by_line[index]):
+            if matchers[row_index](line):
+                yield index + 1, rows[row_index], line
+
+
 class PerformanceAnalyzer:
     """Analyzes code for performance issues commonly found in AI-generated code."""
 
@@ -16,93 +224,79 @@ class PerformanceAnalyzer:
         """Initialize the performance analyzer."""
         self.config = config
         self.max_complexity = config.get('performance.max_complexity', 10)
+        self.max_file_size = config.get('performance.max_file_size', 1_048_576)
 
-    def analyze_file(self, file_path: str, content: str) -> Tuple[List[Issue], float]:
+    def analyze_file(self, file_path: str, content: str, tree: Optional[ast.AST] = None,
+                     lines: Optional[List[str]] = None,
+                     source: Optional[SourceLines] = None) -> Tuple[List[Issue], float]:
         """Analyze a file for performance issues and return issues + score."""
+        # Very large (usually generated or vendored) files and binary data are not analyzed
+        if len(content) > self.max_file_size or '\x00' in content[:4096]:
+            return [], 10.0
+
         issues = []
         performance_score = 10.0  # Start with perfect score
+        if source is None:
+            source = SourceLines(content, lines)
 
         # Pattern-based analysis
-        pattern_issues = self._analyze_patterns(file_path, content)
+        pattern_issues = self._analyze_patterns(file_path, source)
         issues.extend(pattern_issues)
 
         # AST-based analysis for Python files
         if file_path.endswith('.py'):
-            ast_issues, complexity_score = self._analyze_python_ast(file_path, content)
+            ast_issues, complexity_score = self._analyze_python_ast(file_path, content, tree)
             issues.extend(ast_issues)
             performance_score = min(performance_score, complexity_score)
 
         # JavaScript/TypeScript analysis
         elif file_path.endswith(('.js', '.ts', '.jsx', '.tsx')):
-            js_issues = self._analyze_javascript_patterns(file_path, content)
+            js_issues = self._analyze_javascript_patterns(file_path, source)
             issues.extend(js_issues)
 
         # Calculate performance score based on issues
-        performance_score -= len([i for i in issues if i.severity == 'critical']) * 3
-        performance_score -= len([i for i in issues if i.severity == 'high']) * 2
-        performance_score -= len([i for i in issues if i.severity == 'medium']) * 1
+        severity_counts = Counter(issue.severity for issue in issues)
+        for severity, penalty in _SEVERITY_PENALTIES:
+            performance_score -= severity_counts[severity] * penalty
         performance_score = max(0.0, performance_score)
 
         return issues, performance_score
 
-    def _analyze_patterns(self, file_path: str, content: str) -> List[Issue]:
+    def analyze_files(self, file_items: List[Tuple[str, str]]) -> List[Tuple[List[Issue], float]]:
+        """Analyze (file_path, content) pairs, across a process pool when parallelism is enabled.
+
+        Results come back in input order; if worker processes are unavailable the
+        files are analyzed in this process instead.
+        """
+        return run_pooled(PerformanceAnalyzer, 'analyze_file', file_items, self.config, _ANALYZE_CHUNK_SIZE,
+                          local=self)
+
+    def _analyze_patterns(self, file_path: str, source: SourceLines) -> List[Issue]:
         """Analyze using regex patterns for common performance issues."""
         issues = []
-        lines = content.splitlines()
-
-        # Inefficient loop patterns
-        inefficient_patterns = [
-            (r'for.*in.*range\(len\(', 'Inefficient loop - use enumerate() or direct iteration', 'medium'),
-            (r'while.*len\(.*\)\s*>', 'Inefficient while loop checking length', 'medium'),
-            (r'\.append\(.*\)\s*\n.*for.*in', 'List comprehension may be more efficient', 'low'),
-            (r'list\(filter\(.*list\(map\(', 'Nested list comprehension may be more efficient', 'medium'),
-        ]
-
-        # Memory usage patterns
-        memory_patterns = [
-            (r'.*\+=.*\[.*\]', 'Potential memory inefficiency with list concatenation', 'medium'),
-            (r'.*\.copy\(\).*in.*loop', 'Copying in loop can cause memory issues', 'high'),
-            (r'pd\.concat.*in.*for', 'Inefficient pandas concatenation in loop', 'high'),
-            (r'np\.concatenate.*for.*in', 'Inefficient numpy concatenation in loop', 'medium'),
-        ]
-
-        # Database/IO patterns
-        io_patterns = [
-            (r'\.execute\(.*for.*in', 'Database queries in loop - consider batch operations', 'high'),
-            (r'open\(.*for.*in', 'File operations in loop can be inefficient', 'medium'),
-            (r'requests\.get\(.*for', 'HTTP requests in loop without session reuse', 'high'),
-            (r'time\.sleep\(.*for', 'Sleep in loop may indicate inefficient design', 'low'),
-        ]
-
-        all_patterns = [
-            *[(p, d, s) for p, d, s in inefficient_patterns],
-            *[(p, d, s) for p, d, s in memory_patterns],
-            *[(p, d, s) for p, d, s in io_patterns],
-        ]
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description, severity in all_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append(Issue(
-                        severity=severity,
-                        category='performance',
-                        message=description,
-                        file_path=file_path,
-                        line_number=line_num,
-                        rule_id='performance.pattern',
-                        source_snippet=line.strip(),
-                        suggestion=self._get_performance_suggestion(description)
-                    ))
+
+        for line_num, (_, description, severity, suggestion), line in _matching_rows(
+                source, _ALL_PATTERNS, _ALL_LINE_MATCHERS, _ALL_CANDIDATES_RE, _ALL_ANCHORS):
+            issues.append(_PATTERN_ISSUE(
+                severity=severity,
+                message=description,
+                file_path=file_path,
+                line_number=line_num,
+                source_snippet=line.strip(),
+                suggestion=suggestion
+            ))
 
         return issues
 
-    def _analyze_python_ast(self, file_path: str, content: str) -> Tuple[List[Issue], float]:
+    def _analyze_python_ast(self, file_path: str, content: str,
+                            tree: Optional[ast.AST] = None) -> Tuple[List[Issue], float]:
         """Analyze Python code using AST for complexity and performance issues."""
         issues = []
         complexity_score = 10.0
 
         try:
-            tree = ast.parse(content)
+            if tree is None:
+                tree = parse_python_cached(content, file_path)
             visitor = PerformanceASTVisitor(file_path, self.max_complexity)
             visitor.visit(tree)
             issues.extend(visitor.issues)
@@ -122,51 +316,35 @@ class PerformanceAnalyzer:
 
         return issues, complexity_score
 
-    def _analyze_javascript_patterns(self, file_path: str, content: str) -> List[Issue]:
+    def _analyze_javascript_patterns(self, file_path: str, source: SourceLines) -> List[Issue]:
         """Analyze JavaScript/TypeScript for performance issues."""
         issues = []
-        lines = content.splitlines()
-
-        js_patterns = [
-            (r'document\.getElementById.*in.*for', 'DOM queries in loop are inefficient', 'high'),
-            (r'\.innerHTML\s*\+=', 'innerHTML concatenation causes reflow', 'medium'),
-            (r'new.*RegExp.*in.*for', 'RegExp creation in loop is inefficient', 'medium'),
-            (r'JSON\.parse.*JSON\.stringify', 'Deep clone via JSON is inefficient', 'medium'),
-            (r'addEventListener.*in.*for', 'Event listeners in loop without cleanup', 'high'),
-        ]
-
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description, severity in js_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append(Issue(
-                        severity=severity,
-                        category='performance',
-                        message=description,
-                        file_path=file_path,
-                        line_number=line_num,
-                        rule_id='performance.javascript',
-                        source_snippet=line.strip()
-                    ))
+
+        for line_num, (_, description, severity), line in _matching_rows(
+                source, _JS_PATTERNS, _JS_LINE_MATCHERS, _JS_CANDIDATES_RE, _JS_ANCHORS):
+            issues.append(_JAVASCRIPT_ISSUE(
+                severity=severity,
+                message=description,
+                file_path=file_path,
+                line_number=line_num,
+                source_snippet=line.strip()
+            ))
 
         return issues
 
     def _get_performance_suggestion(self, description: str) -> str:
         """Get performance improvement suggestions."""
-        suggestions = {
-            'inefficient loop': 'Use enumerate() or iterate directly over the collection.',
-            'list comprehension': 'Consider using list comprehension for better performance.',
-            'concatenation': 'Use join() for string concatenation or extend() for lists.',
-            'database queries': 'Use batch operations or bulk inserts instead of individual queries.',
-            'http requests': 'Use session objects to reuse connections.',
-            'dom queries': 'Cache DOM elements outside of loops.',
-            'memory inefficiency': 'Consider using generators or processing data in chunks.',
-        }
+        return _performance_suggestion(description)
 
-        for key, suggestion in suggestions.items():
-            if key.lower() in description.lower():
-                return suggestion
 
-        return 'Review this code for potential performance improvements.'
+def _is_range_len(node: ast.AST) -> bool:
+    """Check if an expression is a call range(len(...))."""
+    # Exact type checks: the parser never produces subclasses of these nodes
+    if type(node) is not ast.Call or len(node.args) != 1:
+        return False
+    func, arg = node.func, node.args[0]
+    return (type(func) is ast.Name and func.id == 'range' and type(arg) is ast.Call
+            and type(arg.func) is ast.Name and arg.func.id == 'len')
 
 
 class PerformanceASTVisitor(ast.NodeVisitor):
@@ -191,14 +369,11 @@ class PerformanceASTVisitor(ast.NodeVisitor):
 
         # Check complexity
         if self.current_complexity > self.max_complexity:
-            self.issues.append(Issue(
+            self.issues.append(_COMPLEXITY_ISSUE(
                 severity='medium' if self.current_complexity <= self.max_complexity * 1.5 else 'high',
-                category='performance',
                 message=f'Function complexity ({self.current_complexity}) exceeds threshold ({self.max_complexity})',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='performance.complexity',
-                suggestion='Consider breaking this function into smaller functions.'
+                line_number=node.lineno
             ))
 
         self.function_complexities.append(self.current_complexity)
@@ -212,32 +387,18 @@ class PerformanceASTVisitor(ast.NodeVisitor):
 
         # Check for nested loops
         if self.nested_loops > 2:
-            self.issues.append(Issue(
-                severity='medium',
-                category='performance',
+            self.issues.append(_NESTED_LOOPS_ISSUE(
                 message=f'Deeply nested loops (depth: {self.nested_loops}) may cause performance issues',
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='performance.nested_loops',
-                suggestion='Consider flattening the loop structure or using more efficient algorithms.'
+                line_number=node.lineno
             ))
 
         # Check for inefficient patterns
-        if isinstance(node.iter, ast.Call):
-            if isinstance(node.iter.func, ast.Name) and node.iter.func.id == 'range':
-                if len(node.iter.args) == 1:
-                    if isinstance(node.iter.args[0], ast.Call):
-                        func = node.iter.args[0].func
-                        if isinstance(func, ast.Name) and func.id == 'len':
-                            self.issues.append(Issue(
-                                severity='low',
-                                category='performance',
-                                message='Use enumerate() or direct iteration instead of range(len())',
-                                file_path=self.file_path,
-                                line_number=node.lineno,
-                                rule_id='performance.range_len',
-                                suggestion='Use "for i, item in enumerate(collection)" or "for item in collection".'
-                            ))
+        if _is_range_len(node.iter):
+            self.issues.append(_RANGE_LEN_ISSUE(
+                file_path=self.file_path,
+                line_number=node.lineno
+            ))
 
         self.generic_visit(node)
         self.nested_loops = old_nested
@@ -269,14 +430,9 @@ class PerformanceASTVisitor(ast.NodeVisitor):
         # Check for nested comprehensions
         if any(isinstance(gen.iter, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp))
                for gen in node.generators):
-            self.issues.append(Issue(
-                severity='medium',
-                category='performance',
-                message='Nested list comprehensions can be hard to read and maintain',
+            self.issues.append(_NESTED_COMPREHENSION_ISSUE(
                 file_path=self.file_path,
-                line_number=node.lineno,
-                rule_id='performance.nested_comprehension',
-                suggestion='Consider breaking into separate comprehensions or using traditional loops.'
+                line_number=node.lineno
             ))
 
         self.generic_visit(node)
@@ -284,20 +440,52 @@ class PerformanceASTVisitor(ast.NodeVisitor):
     def visit_Call(self, node):
         """Visit function calls to detect performance issues."""
         # Check for inefficient function calls
-        if isinstance(node.func, ast.Attribute):
-            if node.func.attr == 'append' and self.nested_loops > 0:
-                self.issues.append(Issue(
-                    severity='low',
-                    category='performance',
-                    message='List.append() in nested loop may be inefficient',
-                    file_path=self.file_path,
-                    line_number=node.lineno,
-                    rule_id='performance.append_in_loop',
-                    suggestion='Consider using list comprehension or preallocating the list.'
-                ))
+        if self.nested_loops > 0 and type(node.func) is ast.Attribute and node.func.attr == 'append':
+            self.issues.append(_APPEND_IN_LOOP_ISSUE(
+                file_path=self.file_path,
+                line_number=node.lineno
+            ))
 
         self.generic_visit(node)
 
+    # Handlers by exact node type; NodeVisitor.visit would look them up by name
+    _handlers = {
+        ast.FunctionDef: visit_FunctionDef,
+        ast.For: visit_For,
+        ast.While: visit_While,
+        ast.If: visit_If,
+        ast.Try: visit_Try,
+        ast.With: visit_With,
+        ast.ListComp: visit_ListComp,
+        ast.Call: visit_Call,
+    }
+
+    def visit(self, node):
+        """Visit a node: run its handler or visit its children."""
+        node_type = type(node)
+        if node_type is ast.Name or node_type is ast.Constant:
+            # Leaves without a handler; nothing below them to visit
+            return
+
+        handler = self._handlers.get(node_type)
+        if handler is not None:
+            handler(self, node)
+        else:
+            self.generic_visit(node)
+
+    def generic_visit(self, node):
+        """Visit the children of a node, skipping Load/Store/Del context leaves."""
+        # Inlined ast.iter_child_nodes: the generator dominated visiting time
+        visit = self.visit
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if type(value) is list:
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        visit(item)
+            elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                visit(value)
+
     def get_complexity_score(self) -> float:
         """Calculate complexity score."""
         if not self.function_complexities:
@@ -311,4 +499,5 @@ class PerformanceASTVisitor(ast.NodeVisitor):
         score -= max(0, (avg_complexity - self.max_complexity) * 0.5)
         score -= max(0, (max_complexity - self.max_complexity * 1.5) * 0.3)
 
-        return max(0.0, score)
\ No newline at end of file
+        return max(0.0, score)
+
@@ -1,151 +1,63 @@
 """Report generation for Code Guardian analysis results."""
 
+import dataclasses
 import json
 import datetime
+from collections import Counter
+from functools import cache
 from pathlib import Path
-from typing import Dict, Any, List
-from jinja2 import Template
+from typing import Dict, Any
+from jinja2 import Environment, Template
 
 from .models import AnalysisResults, Issue
 from .config import Config
 
+try:
+    import orjson
+except ImportError:  # Optional accelerator (pip install codeGuardian[fast])
+    orjson = None
 
-class ReportGenerator:
-    """Generates reports in various formats from analysis results."""
+# SARIF result levels by issue severity (anything else is a warning)
+_SARIF_LEVELS = {
+    'critical': 'error',
+    'high': 'error',
+    'medium': 'warning',
+    'low': 'note'
+}
 
-    def __init__(self, config: Config):
-        """Initialize the report generator."""
-        self.config = config
+# The JSON report is written in many small pieces; a larger buffer batches them
+_WRITE_BUFFER_SIZE = 1 << 16
 
-    def generate_json_report(self, results: AnalysisResults, output_path: str) -> None:
-        """Generate a JSON report."""
-        report_data = {
-            'metadata': {
-                'tool': 'Code Guardian',
-                'version': '0.1.0',
-                'generated_at': datetime.datetime.now().isoformat(),
-                'execution_time': results.execution_time,
-            },
-            'summary': {
-                'files_scanned': results.files_scanned,
-                'security_issues': results.security_issues,
-                'performance_issues': results.performance_issues,
-                'maintainability_score': results.maintainability_score,
-                'ai_generated_percentage': results.ai_generated_percentage,
-                'total_issues': len(results.issues),
-            },
-            'issues': [self._serialize_issue(issue) for issue in results.issues],
-            'file_scores': results.file_scores,
-            'issues_by_severity': {
-                'critical': len([i for i in results.issues if i.severity == 'critical']),
-                'high': len([i for i in results.issues if i.severity == 'high']),
-                'medium': len([i for i in results.issues if i.severity == 'medium']),
-                'low': len([i for i in results.issues if i.severity == 'low']),
-            },
-            'issues_by_category': {
-                'security': len([i for i in results.issues if i.category == 'security']),
-                'performance': len([i for i in results.issues if i.category == 'performance']),
-                'maintainability': len([i for i in results.issues if i.category == 'maintainability']),
-            }
-        }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
-
-    def generate_html_report(self, results: AnalysisResults, output_path: str) -> None:
-        """Generate an HTML report."""
-        template = self._get_html_template()
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses (issues, AI patterns) for the JSON encoders."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
 
-        # Prepare data for template
-        template_data = {
-            'generated_at': datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'results': results,
-            'issues_by_severity': self._group_issues_by_severity(results.issues),
-            'issues_by_category': self._group_issues_by_category(results.issues),
-            'issues_by_file': self._group_issues_by_file(results.issues),
-            'severity_colors': {
-                'critical': '#dc3545',
-                'high': '#fd7e14',
-                'medium': '#ffc107',
-                'low': '#6c757d'
-            },
-            'category_colors': {
-                'security': '#dc3545',
-                'performance': '#fd7e14',
-                'maintainability': '#17a2b8'
-            }
-        }
 
-        html_content = template.render(**template_data)
+def _dumps(obj: Any) -> bytes:
+    """Serialize a value to compact UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
 
-    def generate_sarif_report(self, results: AnalysisResults, output_path: str) -> None:
-        """Generate a SARIF (Static Analysis Results Interchange Format) report."""
-        sarif_data = {
-            "version": "2.1.0",
-            "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
-            "runs": [{
-                "tool": {
-                    "driver": {
-                        "name": "Code Guardian",
-                        "version": "0.1.0",
-                        "informationUri": "https://github.com/yes-its-shivam/codeGuardian",
-                        "rules": self._get_sarif_rules(results.issues)
-                    }
-                },
-                "results": [self._convert_issue_to_sarif(issue) for issue in results.issues]
-            }]
-        }
+def _dumps_indented(obj: Any) -> bytes:
+    """Serialize a value to UTF-8 JSON indented by two spaces, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default).encode('utf-8')
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(sarif_data, f, indent=2)
 
-    def _serialize_issue(self, issue: Issue) -> Dict[str, Any]:
-        """Convert an Issue object to a dictionary."""
-        return {
-            'severity': issue.severity,
-            'category': issue.category,
-            'message': issue.message,
-            'file_path': issue.file_path,
-            'line_number': issue.line_number,
-            'column': issue.column,
-            'rule_id': issue.rule_id,
-            'confidence': issue.confidence,
-            'source_snippet': issue.source_snippet,
-            'suggestion': issue.suggestion
-        }
+@cache
+def _html_template() -> Template:
+    """Compile the HTML report template on first use; later reports reuse it."""
+    return Environment(autoescape=True).from_string(_HTML_TEMPLATE_SOURCE)
 
-    def _group_issues_by_severity(self, issues: List[Issue]) -> Dict[str, List[Issue]]:
-        """Group issues by severity level."""
-        groups = {'critical': [], 'high': [], 'medium': [], 'low': []}
-        for issue in issues:
-            if issue.severity in groups:
-                groups[issue.severity].append(issue)
-        return groups
-
-    def _group_issues_by_category(self, issues: List[Issue]) -> Dict[str, List[Issue]]:
-        """Group issues by category."""
-        groups = {}
-        for issue in issues:
-            if issue.category not in groups:
-                groups[issue.category] = []
-            groups[issue.category].append(issue)
-        return groups
-
-    def _group_issues_by_file(self, issues: List[Issue]) -> Dict[str, List[Issue]]:
-        """Group issues by file path."""
-        groups = {}
-        for issue in issues:
-            if issue.file_path not in groups:
-                groups[issue.file_path] = []
-            groups[issue.file_path].append(issue)
-        return groups
 
-    def _get_html_template(self) -> Template:
-        """Get the HTML report template."""
-        template_str = '''<!DOCTYPE html>
+# Rendered with autoescaping, so messages and snippets cannot inject markup
+_HTML_TEMPLATE_SOURCE = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -256,29 +168,160 @@ class ReportGenerator:
     </div>
 </body>
 </html>'''
-        return Template(template_str)
 
-    def _get_sarif_rules(self, issues: List[Issue]) -> List[Dict[str, Any]]:
-        """Generate SARIF rules from issues."""
+
+class ReportGenerator:
+    """Generates reports in various formats from analysis results."""
+
+    def __init__(self, config: Config):
+        """Initialize the report generator."""
+        self.config = config
+
+    def generate_json_report(self, results: AnalysisResults, output_path: str) -> None:
+        """Generate a JSON report.
+
+        Issues are serialized and written one at a time rather than collected into
+        one large document first. The report is compact unless reporting.pretty is
+        set, which puts each top-level key and each issue on its own line.
+        """
+        generated_at = self._now()
+        severity_counts: Counter = Counter()
+        category_counts: Counter = Counter()
+        for issue in results.issues:
+            severity_counts[issue.severity] += 1
+            category_counts[issue.category] += 1
+
+        head = {
+            'metadata': {
+                'tool': 'Code Guardian',
+                'version': '0.1.0',
+                'generated_at': generated_at.isoformat(),
+                'execution_time': results.execution_time,
+            },
+            'summary': {
+                'files_scanned': results.files_scanned,
+                'security_issues': results.security_issues,
+                'performance_issues': results.performance_issues,
+                'maintainability_score': results.maintainability_score,
+                'ai_generated_percentage': results.ai_generated_percentage,
+                'total_issues': len(results.issues),
+            },
+        }
+        tail = {
+            'file_scores': results.file_scores,
+            'issues_by_severity': {
+                severity: severity_counts[severity] for severity in ('critical', 'high', 'medium', 'low')
+            },
+            'issues_by_category': {
+                category: category_counts[category]
+                for category in ('security', 'performance', 'maintainability')
+            },
+        }
+
+        if self.config.get('reporting.pretty', False):
+            newline, indent, colon = b'\n', b'  ', b': '
+        else:
+            newline, indent, colon = b'', b'', b':'
+
+        with open(output_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(b'{' + newline)
+            for key, value in head.items():
+                f.write(indent + _dumps(key) + colon + _dumps(value) + b',' + newline)
+
+            # Issue dataclasses serialize directly, one at a time
+            f.write(indent + b'"issues"' + colon + b'[')
+            separator = newline + indent * 2
+            for issue in results.issues:
+                f.write(separator)
+                f.write(_dumps(issue))
+                separator = b',' + newline + indent * 2
+            f.write((newline + indent if results.issues else b'') + b'],' + newline)
+
+            f.write((b',' + newline).join(indent + _dumps(key) + colon + _dumps(value) for key, value in tail.items()))
+            f.write(newline + b'}\n')
+
+    def generate_html_report(self, results: AnalysisResults, output_path: str) -> None:
+        """Generate an HTML report."""
+        generated_at = self._now()
+        template = self._get_html_template()
+
+        # Prepare data for template
+        template_data = {
+            'generated_at': generated_at.strftime('%Y-%m-%d %H:%M:%S UTC'),
+            'results': results,
+            'severity_colors': {
+                'critical': '#dc3545',
+                'high': '#fd7e14',
+                'medium': '#ffc107',
+                'low': '#6c757d'
+            },
+            'category_colors': {
+                'security': '#dc3545',
+                'performance': '#fd7e14',
+                'maintainability': '#17a2b8'
+            }
+        }
+
+        html_content = template.render(**template_data)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+
+    def generate_sarif_report(self, results: AnalysisResults, output_path: str) -> None:
+        """Generate a SARIF (Static Analysis Results Interchange Format) report."""
+        # One pass collects the results and, from each rule's first issue, its rule
         rules = {}
-        for issue in issues:
+        sarif_results = []
+        for issue in results.issues:
             if issue.rule_id and issue.rule_id not in rules:
-                rules[issue.rule_id] = {
-                    "id": issue.rule_id,
-                    "name": issue.rule_id.replace('.', '_').upper(),
-                    "shortDescription": {"text": issue.message},
-                    "fullDescription": {"text": issue.suggestion or issue.message},
-                    "defaultConfiguration": {
-                        "level": self._severity_to_sarif_level(issue.severity)
+                rules[issue.rule_id] = self._sarif_rule(issue)
+            sarif_results.append(self._convert_issue_to_sarif(issue))
+
+        sarif_data = {
+            "version": "2.1.0",
+            "$schema": "https://raw.githubusercontent.com/oasis-tcs/sarif-spec/master/Schemata/sarif-schema-2.1.0.json",
+            "runs": [{
+                "tool": {
+                    "driver": {
+                        "name": "Code Guardian",
+                        "version": "0.1.0",
+                        "informationUri": "https://github.com/yes-its-shivam/codeGuardian",
+                        "rules": list(rules.values())
                     }
-                }
-        return list(rules.values())
+                },
+                "results": sarif_results
+            }]
+        }
+
+        # SARIF is read by tools, so it is compact unless reporting.pretty is set
+        dumps = _dumps_indented if self.config.get('reporting.pretty', False) else _dumps
+        Path(output_path).write_bytes(dumps(sarif_data))
+
+    def _now(self) -> datetime.datetime:
+        """Get the report timestamp, taken once per report in UTC."""
+        return datetime.datetime.now(datetime.timezone.utc)
+
+    def _get_html_template(self) -> Template:
+        """Get the HTML report template."""
+        return _html_template()
+
+    def _sarif_rule(self, issue: Issue) -> Dict[str, Any]:
+        """Generate the SARIF rule for an issue's rule_id."""
+        return {
+            "id": issue.rule_id,
+            "name": issue.rule_id.replace('.', '_').upper(),
+            "shortDescription": {"text": issue.message},
+            "fullDescription": {"text": issue.suggestion or issue.message},
+            "defaultConfiguration": {
+                "level": _SARIF_LEVELS.get(issue.severity, 'warning')
+            }
+        }
 
     def _convert_issue_to_sarif(self, issue: Issue) -> Dict[str, Any]:
         """Convert an Issue to SARIF format."""
         return {
             "ruleId": issue.rule_id,
-            "level": self._severity_to_sarif_level(issue.severity),
+            "level": _SARIF_LEVELS.get(issue.severity, 'warning'),
             "message": {"text": issue.message},
             "locations": [{
                 "physicalLocation": {
@@ -293,10 +336,4 @@ class ReportGenerator:
 
     def _severity_to_sarif_level(self, severity: str) -> str:
         """Convert severity to SARIF level."""
-        mapping = {
-            'critical': 'error',
-            'high': 'error',
-            'medium': 'warning',
-            'low': 'note'
-        }
-        return mapping.get(severity, 'warning')
\ No newline at end of file
+        return _SARIF_LEVELS.get(severity, 'warning')
\ No newline at end of file
@@ -2,12 +2,39 @@
 
 import re
 import ast
-from typing import List, Dict, Any, Optional
+import string
+from functools import partial
+from typing import Callable, List, Dict, Any, Optional, Pattern, Tuple
 from pathlib import Path
 
+from .linematch import fuse_folded, line_matcher
+from .literals import LiteralGroups
+from .parallel import run_pooled
+from .parsing import parse_python_cached
 from .models import Issue
+from .source import SourceLines
 from .config import Config
 
+# Files handed to a pool worker per task when scanning a batch
+_SCAN_CHUNK_SIZE = 32
+
+# Characters of a base64-like string literal flagged as a potential secret
+_SECRET_CHARS = string.ascii_letters + string.digits + '+/='
+
+# Suggestions keyed by a phrase of the issue category, checked in order
+_SUGGESTIONS = {
+    'sql_injection': 'Use parameterized queries or ORM methods instead of string concatenation.',
+    'xss': 'Sanitize user input and use safe DOM manipulation methods.',
+    'secrets': 'Move secrets to environment variables or secure key management systems.',
+    'deserialization': 'Validate input and use safe serialization formats like JSON.',
+    'ai_specific': 'Validate file paths and sanitize inputs before loading models.',
+}
+
+
+def _compile_patterns(patterns: List[Tuple[str, str]]) -> List[Tuple[Pattern, str]]:
+    """Compile (pattern, description) rows once, ignoring case."""
+    return [(re.compile(pattern, re.IGNORECASE), description) for pattern, description in patterns]
+
 
 class SecurityScanner:
     """Scans code for security vulnerabilities commonly found in AI-generated code."""
@@ -20,99 +47,145 @@ class SecurityScanner:
     def _init_vulnerability_patterns(self):
         """Initialize vulnerability detection patterns."""
         # SQL Injection patterns
-        self.sql_injection_patterns = [
+        self.sql_injection_patterns = _compile_patterns([
             (r'execute\s*\(\s*["\'].*%.*["\']', 'SQL injection via string formatting'),
             (r'cursor\.execute\s*\(\s*f["\']', 'SQL injection via f-string'),
             (r'query\s*=\s*["\'].*\+.*["\']', 'SQL injection via string concatenation'),
             (r'WHERE.*=.*\+', 'Potential SQL injection in WHERE clause'),
-        ]
+        ])
 
         # XSS patterns
-        self.xss_patterns = [
+        self.xss_patterns = _compile_patterns([
             (r'innerHTML\s*=.*\+', 'XSS via innerHTML concatenation'),
             (r'document\.write\s*\(.*\+', 'XSS via document.write concatenation'),
             (r'eval\s*\(.*user', 'XSS via eval with user input'),
             (r'<script>.*\${', 'XSS via template literal in script tag'),
-        ]
+        ])
 
         # Hardcoded secrets patterns
-        self.secret_patterns = [
+        self.secret_patterns = _compile_patterns([
             (r'password\s*=\s*["\'][^"\']{8,}["\']', 'Hardcoded password'),
             (r'api[_-]?key\s*=\s*["\'][A-Za-z0-9]{16,}["\']', 'Hardcoded API key'),
             (r'secret[_-]?key\s*=\s*["\'][A-Za-z0-9]{16,}["\']', 'Hardcoded secret key'),
             (r'token\s*=\s*["\'][A-Za-z0-9]{20,}["\']', 'Hardcoded token'),
             (r'aws[_-]?access[_-]?key.*=\s*["\']AKIA[A-Z0-9]{16}["\']', 'AWS access key'),
-        ]
+        ])
 
         # Unsafe deserialization patterns
-        self.deserialization_patterns = [
+        self.deserialization_patterns = _compile_patterns([
             (r'pickle\.loads?\s*\(', 'Unsafe pickle deserialization'),
             (r'yaml\.load\s*\(', 'Unsafe YAML deserialization'),
             (r'json\.loads?\s*\(.*input', 'Potentially unsafe JSON deserialization'),
             (r'eval\s*\(', 'Code injection via eval'),
             (r'exec\s*\(', 'Code injection via exec'),
-        ]
+        ])
 
         # AI-specific vulnerability patterns
-        self.ai_specific_patterns = [
+        self.ai_specific_patterns = _compile_patterns([
             (r'model\.load\s*\(.*input', 'Unsafe model loading from user input'),
             (r'torch\.load\s*\(.*request', 'Unsafe PyTorch model loading'),
             (r'joblib\.load\s*\(.*user', 'Unsafe joblib loading from user input'),
             (r'subprocess\.call\s*\(.*input', 'Command injection via subprocess'),
             (r'os\.system\s*\(.*\+', 'Command injection via os.system'),
+        ])
+
+        # One alternation per category finds the lines any of its patterns could match
+        # (from each pattern's longest '.*'-free piece, searched in folded content)
+        self.category_regexes = {
+            'sql_injection': fuse_folded(self.sql_injection_patterns),
+            'xss': fuse_folded(self.xss_patterns),
+            'secrets': fuse_folded(self.secret_patterns),
+            'deserialization': fuse_folded(self.deserialization_patterns),
+            'ai_specific': fuse_folded(self.ai_specific_patterns),
+        }
+
+        # Enabled categories with (line matcher, description) rows for their patterns
+        # and an issue template carrying the category's severity, rule id and
+        # suggestion, resolved from configuration once
+        self.enabled_categories = [
+            (category, [(line_matcher(pattern), description) for pattern, description in patterns],
+             partial(Issue, severity=default_severity, category='security', rule_id=f'security.{category}',
+                     suggestion=self._get_security_suggestion(category, '')))
+            for category, patterns, default_severity in [
+                ('sql_injection', self.sql_injection_patterns, 'high'),
+                ('xss', self.xss_patterns, 'high'),
+                ('secrets', self.secret_patterns, 'critical'),
+                ('deserialization', self.deserialization_patterns, 'critical'),
+                ('ai_specific', self.ai_specific_patterns, 'high'),
+            ]
+            if self._is_category_enabled(category)
         ]
 
-    def scan_file(self, file_path: str, content: str) -> List[Issue]:
-        """Scan a file for security vulnerabilities."""
+        # Literals (case-insensitive) that every pattern in a category requires;
+        # files containing none of them cannot match and skip the category
+        category_literals = {
+            'sql_injection': ['execute', 'query', 'where'],
+            'xss': ['innerhtml', 'document.write', 'eval', '<script>'],
+            'secrets': ['password', 'api', 'secret', 'token', 'aws'],
+            'deserialization': ['pickle.load', 'yaml.load', 'json.load', 'eval', 'exec'],
+            'ai_specific': ['model.load', 'torch.load', 'joblib.load', 'subprocess.call', 'os.system'],
+        }
+        self.category_triggers = LiteralGroups({
+            category: category_literals[category] for category, _, _ in self.enabled_categories
+        })
+
+    def scan_file(self, file_path: str, content: str, tree: Optional[ast.AST] = None,
+                  lines: Optional[List[str]] = None, source: Optional[SourceLines] = None) -> List[Issue]:
+        """Scan a file for security vulnerabilities (source, if given, is SourceLines(content))."""
         issues = []
-        lines = content.splitlines()
+        if source is None:
+            source = SourceLines(content, lines)
+        # One pass over the content finds the categories that could match at all
+        triggered = self.category_triggers.present(content)
 
         # Pattern-based scanning
-        all_patterns = [
-            ('sql_injection', self.sql_injection_patterns, 'high'),
-            ('xss', self.xss_patterns, 'high'),
-            ('secrets', self.secret_patterns, 'critical'),
-            ('deserialization', self.deserialization_patterns, 'critical'),
-            ('ai_specific', self.ai_specific_patterns, 'high'),
-        ]
-
-        for category, patterns, default_severity in all_patterns:
-            if self._is_category_enabled(category):
-                issues.extend(self._scan_patterns(file_path, lines, patterns, category, default_severity))
+        for category, matchers, new_issue in self.enabled_categories:
+            if category in triggered:
+                issues.extend(self._scan_patterns(file_path, source, matchers, category, new_issue))
 
         # AST-based scanning for Python files
         if file_path.endswith('.py'):
-            issues.extend(self._scan_python_ast(file_path, content))
+            issues.extend(self._scan_python_ast(file_path, content, tree))
 
         return issues
 
-    def _scan_patterns(self, file_path: str, lines: List[str], patterns: List[tuple],
-                      category: str, default_severity: str) -> List[Issue]:
-        """Scan lines using regex patterns."""
+    def scan_files(self, file_items: List[Tuple[str, str]]) -> List[List[Issue]]:
+        """Scan (file_path, content) pairs, across a process pool when parallelism is enabled.
+
+        Results come back in input order; if worker processes are unavailable the
+        files are scanned in this process instead.
+        """
+        return run_pooled(SecurityScanner, 'scan_file', file_items, self.config, _SCAN_CHUNK_SIZE, local=self)
+
+    def _scan_patterns(self, file_path: str, source: SourceLines, matchers: List[tuple],
+                      category: str, new_issue: Callable[..., Issue]) -> List[Issue]:
+        """Scan lines using regex patterns.
+
+        The category's alternation searches the whole content once; each pattern's
+        line matcher then checks the lines it finds one at a time, in linear time.
+        """
         issues = []
 
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description in patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    issues.append(Issue(
-                        severity=default_severity,
-                        category='security',
-                        message=f'{description}',
+        for line_num, line in source.matching_lines(self.category_regexes[category], source.folded):
+            for matches, description in matchers:
+                if matches(line):
+                    issues.append(new_issue(
+                        message=description,
                         file_path=file_path,
                         line_number=line_num,
-                        rule_id=f'security.{category}',
-                        source_snippet=line.strip(),
-                        suggestion=self._get_security_suggestion(category, description)
+                        source_snippet=line.strip()
                     ))
 
         return issues
 
-    def _scan_python_ast(self, file_path: str, content: str) -> List[Issue]:
+    def _scan_python_ast(self, file_path: str, content: str,
+                         tree: Optional[ast.AST] = None) -> List[Issue]:
         """Scan Python code using AST analysis."""
         issues = []
 
         try:
-            tree = ast.parse(content)
+            if tree is None:
+                tree = parse_python_cached(content, file_path)
             visitor = SecurityASTVisitor(file_path)
             visitor.visit(tree)
             issues.extend(visitor.issues)
@@ -145,23 +218,15 @@ class SecurityScanner:
         return self.config.get(f'security.{config_key}', True)
 
     def _get_security_suggestion(self, category: str, description: str) -> str:
-        """Get security improvement suggestion."""
-        suggestions = {
-            'sql_injection': 'Use parameterized queries or ORM methods instead of string concatenation.',
-            'xss': 'Sanitize user input and use safe DOM manipulation methods.',
-            'secrets': 'Move secrets to environment variables or secure key management systems.',
-            'deserialization': 'Validate input and use safe serialization formats like JSON.',
-            'ai_specific': 'Validate file paths and sanitize inputs before loading models.',
-        }
-
-        for key, suggestion in suggestions.items():
+        """Get security improvement suggestion (it depends on the category only)."""
+        for key, suggestion in _SUGGESTIONS.items():
             if key in category.lower():
                 return suggestion
 
         return 'Review this code for potential security issues.'
 
 
-class SecurityASTVisitor(ast.NodeVisitor):
+class SecurityASTVisitor:
     """AST visitor for Python security analysis."""
 
     def __init__(self, file_path: str):
@@ -201,8 +266,6 @@ class SecurityASTVisitor(ast.NodeVisitor):
                         suggestion='Use subprocess.run() with shell=False instead of os.system().'
                     ))
 
-        self.generic_visit(node)
-
     def visit_Import(self, node):
         """Visit import statements to detect risky imports."""
         for alias in node.names:
@@ -217,14 +280,19 @@ class SecurityASTVisitor(ast.NodeVisitor):
                     suggestion='Consider using safer serialization formats like JSON.'
                 ))
 
-        self.generic_visit(node)
-
-    def visit_Str(self, node):
+    def visit_Constant(self, node):
         """Visit string literals to detect hardcoded secrets."""
         # Check for potential secrets in string literals
-        value = node.s if hasattr(node, 's') else ''
-
-        if len(value) > 20 and re.match(r'^[A-Za-z0-9+/=]{20,}$', value):
+        value = node.value
+        if not isinstance(value, str) or len(value) <= 20:
+            return
+
+        # Same test as re.match(r'^[A-Za-z0-9+/=]{20,}$', value), whose $ also
+        # matches before a final newline: stripping the allowed characters from
+        # both ends leaves nothing
+        if value[-1] == '\n':
+            value = value[:-1]
+        if not value.strip(_SECRET_CHARS):
             self.issues.append(Issue(
                 severity='medium',
                 category='security',
@@ -235,4 +303,37 @@ class SecurityASTVisitor(ast.NodeVisitor):
                 suggestion='Move secrets to environment variables or configuration files.'
             ))
 
-        self.generic_visit(node)
\ No newline at end of file
+    # Handlers by exact node type
+    _handlers = {
+        ast.Call: visit_Call,
+        ast.Import: visit_Import,
+        ast.Constant: visit_Constant,
+    }
+
+    def visit(self, node):
+        """Visit a tree in the order NodeVisitor would: depth first, each node before its children.
+
+        Walks an explicit stack instead of recursing through generic_visit, and
+        skips Load/Store/Del context leaves.
+        """
+        handlers = self._handlers
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            node_type = type(node)
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(self, node)
+            if node_type is ast.Name or node_type is ast.Constant:
+                continue  # Leaves; nothing below them to visit
+
+            children = []
+            for field in node._fields:
+                value = getattr(node, field, None)
+                if type(value) is list:
+                    children.extend(item for item in value if isinstance(item, ast.AST))
+                elif isinstance(value, ast.AST) and not isinstance(value, ast.expr_context):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+
@@ -0,0 +1,59 @@
+"""Line-oriented views of source text shared by the pattern scanners."""
+
+import re
+from bisect import bisect_right
+from functools import cached_property
+from itertools import accumulate
+from typing import Iterator, List, Optional, Pattern, Tuple
+
+from .literals import fold_case
+
+# Every line boundary str.splitlines() recognizes
+_LINE_BREAK_RE = re.compile('\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+class SourceLines:
+    """File content with its lines (as str.splitlines() splits them) and their offsets."""
+
+    def __init__(self, content: str, lines: Optional[List[str]] = None):
+        """Split content (unless it is already split) and record where each line starts."""
+        self.content = content
+        self.lines = content.splitlines() if lines is None else lines
+        if '\r' in content:
+            # '\r\n' is a two-character break, so locate every break explicitly
+            self.starts = [0] + [match.end() for match in _LINE_BREAK_RE.finditer(content)]
+        else:
+            # Every other break splitlines() knows is a single character
+            self.starts = list(accumulate(map((1).__add__, map(len, self.lines)), initial=0))
+
+    @cached_property
+    def folded(self) -> str:
+        """Get the content case-folded as re.IGNORECASE compares it to ASCII literals.
+
+        Searching this with a lowercased, case-sensitive pattern is much faster than
+        an IGNORECASE search, as the engine can skip ahead to literal prefixes.
+        """
+        return fold_case(self.content)
+
+    def matching_lines(self, pattern: Pattern, text: Optional[str] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (line_number, line) for each line on which a match of pattern starts.
+
+        The whole content (or text, a same-length transform of it such as folded) is
+        searched in one pass; after a hit the search resumes at the next line, so
+        each line is yielded at most once.
+        """
+        search, starts, lines = pattern.search, self.starts, self.lines
+        if text is None:
+            text = self.content
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                return
+            index = bisect_right(starts, match.start()) - 1
+            if index >= len(lines):
+                return
+            yield index + 1, lines[index]
+            if index + 1 >= len(starts):
+                return
+            position = starts[index + 1]
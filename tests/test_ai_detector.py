@@ -0,0 +1,25 @@
+"""Tests for the AI pattern detector."""
+
+from code_guardian.ai_detector import AIPatternDetector
+from code_guardian.config import Config
+
+
+def test_tiny_files_are_not_scanned():
+    """Test that files below ai_detection.min_file_size are skipped."""
+    content = '# This is a helper\ndef my_function():\n    pass\n'
+
+    confidence, patterns = AIPatternDetector(Config()).detect_ai_patterns(content)
+    assert (confidence, patterns) == (0.0, [])
+
+    config = Config()
+    config.set('ai_detection.min_file_size', 0)
+    confidence, patterns = AIPatternDetector(config).detect_ai_patterns(content)
+    assert confidence > 0
+    assert {p.pattern_type for p in patterns} >= {'comment', 'structure'}
+
+
+def test_binary_content_is_not_scanned():
+    """Test that content with a NUL byte near the start is skipped."""
+    content = '\x00' + '# This is a helper\ndef my_function():\n    pass\n' * 10
+
+    assert AIPatternDetector(Config()).detect_ai_patterns(content) == (0.0, [])
@@ -1,8 +1,9 @@
 """Tests for the main code analyzer."""
 
 import pytest
+from dataclasses import asdict
 from pathlib import Path
-from code_guardian.analyzer import CodeAnalyzer
+from code_guardian.analyzer import CodeAnalyzer, MIN_FILES_FOR_PARALLEL
 from code_guardian.models import Issue, AnalysisResults
 from code_guardian.config import Config
 
@@ -129,4 +130,131 @@ def test_get_issues_by_category():
 
     assert len(results.get_issues_by_category('security')) == 1
     assert len(results.get_issues_by_category('performance')) == 1
-    assert len(results.get_issues_by_category('maintainability')) == 1
\ No newline at end of file
+    assert len(results.get_issues_by_category('maintainability')) == 1
+
+
+def test_issue_indexes_follow_added_issues():
+    """Test that severity lookups see issues added later, however they are added."""
+    results = AnalysisResults(issues=[Issue('low', 'maintainability', 'Low issue', 'test.py', 1)])
+    assert not results.has_critical_issues()
+
+    results.add_issue(Issue('critical', 'security', 'Critical issue', 'test.py', 2))
+    assert results.has_critical_issues()
+    assert len(results.get_issues_by_category('security')) == 1
+
+    results.issues.append(Issue('critical', 'security', 'Another issue', 'test.py', 3))
+    assert len(results.get_issues_by_severity('critical')) == 2
+
+    results.issues[1] = Issue('low', 'security', 'Downgraded issue', 'test.py', 2)
+    assert len(results.get_issues_by_severity('critical')) == 1
+
+    results.issues = []
+    assert not results.has_critical_issues()
+
+
+def test_parallel_analysis_matches_serial(tmp_path):
+    """Test that the process pool produces the same results as a serial scan."""
+    for index in range(MIN_FILES_FOR_PARALLEL + 1):
+        (tmp_path / f'module_{index}.py').write_text(
+            f'import pickle\n\ndef handler_{index}(data):\n    return eval(data)\n'
+        )
+
+    def scan(parallel):
+        config = Config()
+        config.set('cache.enabled', False)
+        config.set('parallel.enabled', parallel)
+        config.set('parallel.max_workers', 2)
+        return CodeAnalyzer(config).analyze_paths([str(tmp_path)], min_severity='low')
+
+    serial, parallel = scan(False), scan(True)
+
+    assert parallel.files_scanned == serial.files_scanned
+    assert [asdict(i) for i in parallel.issues] == [asdict(i) for i in serial.issues]
+    assert parallel.file_scores.keys() == serial.file_scores.keys()
+
+
+def test_config_exclude_patterns():
+    """Test compiled exclude patterns, including directory patterns."""
+    config = Config({'exclude': ['*.min.js', 'node_modules/']})
+
+    assert config.is_excluded('static/app.min.js')
+    assert config.is_excluded('web/node_modules/lib/index.js')
+    assert not config.is_excluded('web/src/index.js')
+    assert config.exclude_re(['*.tmp']) is config.exclude_re(['*.tmp'])
+    assert config.exclude_re(directories_only=True).match('node_modules')
+    assert not config.exclude_re(directories_only=True).match('app.min.js')
+
+
+def test_crlf_file_line_numbers(tmp_path):
+    """Test that files with Windows line endings keep their line numbers."""
+    source = tmp_path / 'crlf.py'
+    source.write_bytes(b'import os\r\n\r\nos.system("ls " + name)\r\n')
+    config = Config()
+    config.set('cache.enabled', False)
+
+    issues, _ = CodeAnalyzer(config)._analyze_file(source)
+
+    assert any(i.line_number == 3 and 'os.system' in i.message for i in issues)
+
+
+def test_all_analyzers_disabled_skips_analysis(tmp_path):
+    """Test that no file is analyzed when every analyzer is disabled."""
+    (tmp_path / 'app.py').write_text('result = eval(user_input)\n')
+    config = Config({
+        'security': {'enabled': False},
+        'performance': {'enabled': False},
+        'maintainability': {'enabled': False},
+        'ai_detection': {'enabled': False},
+    })
+    analyzer = CodeAnalyzer(config)
+    analyzer._analyze_file = None  # Would raise if called
+
+    results = analyzer.analyze_paths([str(tmp_path)], min_severity='low')
+
+    assert not config.any_analysis_enabled
+    assert results.files_scanned == 1
+    assert results.issues == []
+
+
+def test_walk_skips_excluded_directories(tmp_path):
+    """Test that directory excludes prune the walk while file excludes do not."""
+    for relative in ['app.py', 'node_modules/lib/index.js', '.env/settings.py', 'pkg.pyc/mod.py']:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('x = 1\n')
+    analyzer = CodeAnalyzer(Config())
+
+    paths, _ = analyzer._walk([str(tmp_path)], [])
+
+    found = sorted(Path(p).relative_to(tmp_path).as_posix() for p in paths)
+    assert found == ['.env/settings.py', 'app.py', 'pkg.pyc/mod.py']
+
+
+def test_identical_files_share_cached_results(tmp_path):
+    """Test that a copy of a cached file reuses its results under its own path."""
+    for directory in ['first', 'second']:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / 'app.py').write_text('result = eval(user_input)\n')
+    config = Config()
+    config.set('cache.directory', str(tmp_path / 'cache'))
+    analyzer = CodeAnalyzer(config)
+
+    first = analyzer._analyze_file(str(tmp_path / 'first' / 'app.py'))
+    second = analyzer._analyze_file(str(tmp_path / 'second' / 'app.py'))
+
+    assert analyzer.result_cache.hits == 1
+    assert second[0]
+    assert all(issue.file_path == str(tmp_path / 'second' / 'app.py') for issue in second[0])
+    assert [issue.message for issue in first[0]] == [issue.message for issue in second[0]]
+
+
+def test_ast_cache_is_opt_in(tmp_path):
+    """Test that parsed trees are only cached when cache.ast is set."""
+    config = Config()
+    config.set('cache.directory', str(tmp_path / 'cache'))
+    assert CodeAnalyzer(config).ast_cache is None
+
+    config = Config()
+    config.set('cache.directory', str(tmp_path / 'cache'))
+    config.set('cache.ast', True)
+    assert CodeAnalyzer(config).ast_cache is not None
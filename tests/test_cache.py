@@ -0,0 +1,126 @@
+"""Tests for the on-disk analysis caches."""
+
+import ast
+import os
+
+import pytest
+from code_guardian.cache import ASTCache, ResultCache
+from code_guardian.models import Issue
+from code_guardian.parsing import parse_python_cached
+
+
+def test_ast_cache_miss_then_hit(tmp_path):
+    """Test that a parsed tree is reused on the second lookup."""
+    cache = ASTCache(tmp_path)
+    source = 'def add(a, b):\n    return a + b\n'
+
+    first = cache.get_or_parse(source)
+    second = cache.get_or_parse(source)
+
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert ast.dump(first) == ast.dump(second)
+
+
+def test_ast_cache_key_depends_on_content(tmp_path):
+    """Test that different sources get different cache entries."""
+    cache = ASTCache(tmp_path)
+
+    cache.get_or_parse('x = 1\n')
+    cache.get_or_parse('x = 2\n')
+
+    assert cache.misses == 2
+    assert cache.hits == 0
+
+
+def test_ast_cache_does_not_store_syntax_errors(tmp_path):
+    """Test that unparsable sources raise and are not cached."""
+    cache = ASTCache(tmp_path)
+
+    with pytest.raises(SyntaxError):
+        cache.get_or_parse('def broken(:\n')
+
+    assert not any(p.is_file() for p in tmp_path.rglob('*'))
+
+
+def test_parse_python_cached_shares_recent_trees():
+    """Test that parsing the same source again returns the same tree."""
+    source = 'def shared(a):\n    return a\n'
+
+    assert parse_python_cached(source, 'shared.py') is parse_python_cached(source, 'shared.py')
+    with pytest.raises(SyntaxError):
+        parse_python_cached('def broken(:\n', 'broken.py')
+
+
+def test_result_cache_round_trip(tmp_path):
+    """Test storing and retrieving per-file results."""
+    cache = ResultCache(tmp_path)
+    key = cache.key_for('app.py', 'x = 1\n', 'config-hash', True)
+
+    assert cache.get(key) is None
+    cache.put(key, ([Issue('low', 'maintainability', 'msg', 'app.py', 1)], {'maintainability_score': 9.5}))
+    issues, scores = cache.get(key)
+
+    assert issues[0].message == 'msg'
+    assert scores == {'maintainability_score': 9.5}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_result_cache_key_depends_on_config(tmp_path):
+    """Test that results are not shared between configurations."""
+    cache = ResultCache(tmp_path)
+
+    assert cache.key_for('app.py', 'x = 1\n', 'a') != cache.key_for('app.py', 'x = 1\n', 'b')
+
+
+def test_result_cache_stat_key_depends_on_signature(tmp_path):
+    """Test that a touched, resized or replaced file gets a different stat key."""
+    key = ResultCache.stat_key_for('app.py', (1_000, 10, 7, 1_000), 'config-hash')
+
+    assert key == ResultCache.stat_key_for('app.py', (1_000, 10, 7, 1_000), 'config-hash')
+    assert key != ResultCache.stat_key_for('app.py', (2_000, 10, 7, 1_000), 'config-hash')
+    assert key != ResultCache.stat_key_for('app.py', (1_000, 11, 7, 1_000), 'config-hash')
+    assert key != ResultCache.stat_key_for('app.py', (1_000, 10, 8, 1_000), 'config-hash')
+    assert key != ResultCache.stat_key_for('app.py', (1_000, 10, 7, 2_000), 'config-hash')
+
+
+def test_result_cache_stat_key_resolves_relative_paths(tmp_path, monkeypatch):
+    """Test that one relative path in two working directories gets two stat keys."""
+    for checkout in ('one', 'two'):
+        (tmp_path / checkout).mkdir()
+    file_stat = (1_000, 10, 7, 1_000)
+
+    monkeypatch.chdir(tmp_path / 'one')
+    key = ResultCache.stat_key_for('src/app.py', file_stat, 'config-hash')
+    monkeypatch.chdir(tmp_path / 'two')
+
+    assert key != ResultCache.stat_key_for('src/app.py', file_stat, 'config-hash')
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='POSIX permissions only')
+def test_cache_ignores_directory_writable_by_others(tmp_path):
+    """Test that entries under a group/world-writable directory are neither read nor written."""
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    cache = ResultCache(shared)
+
+    cache.put('ab12', ([], {}))
+
+    assert not cache.trusted
+    assert cache.lookup('ab12') is None
+    assert not (shared / 'results').exists()
+
+
+def test_result_cache_prunes_old_entries(tmp_path):
+    """Test that the first store deletes entries older than the age limit."""
+    cache = ResultCache(tmp_path)
+    cache.put('aa01', ([], {'old': True}))
+    old_path = cache._path_for('aa01')
+    os.utime(old_path, (0, 0))
+
+    fresh = ResultCache(tmp_path)
+    fresh.put('bb02', ([], {}))
+
+    assert not old_path.exists()
+    assert fresh.lookup('bb02') == ([], {})
@@ -0,0 +1,34 @@
+"""Tests for the literal prefilter matcher."""
+
+import re
+
+from code_guardian.literals import LiteralGroups, LiteralMatcher
+
+
+def test_literal_matcher_ignores_case():
+    """Test that literals are found regardless of case."""
+    matcher = LiteralMatcher(['password', 'document.write'])
+
+    assert matcher.search('DB_PASSWORD = "x"')
+    assert matcher.search('Document.Write(html)')
+    assert not matcher.search('passwd = "x"')
+
+
+def test_literal_matcher_agrees_with_ignorecase_regex():
+    """Test that non-ASCII characters the regex engine folds to ASCII still match."""
+    matcher = LiteralMatcher(['password', 'token', 'id'])
+
+    for text in ['paſſword', 'toKen', 'İd', 'ıd', 'pässword']:
+        assert matcher.search(text) == bool(re.search('password|token|id', text, re.IGNORECASE))
+
+
+def test_literal_groups_find_each_group_once():
+    """Test that the groups found in one pass match searching each group on its own."""
+    groups = LiteralGroups({'sql': ['execute', 'where'], 'xss': ['innerhtml', 'eval'], 'code': ['eval', 'exec']})
+    fallback = LiteralGroups({'sql': ['execute', 'where'], 'xss': ['innerhtml', 'eval'], 'code': ['eval', 'exec']})
+    fallback._automaton = None
+
+    for text in ['x = 1', 'EVAL(data)', 'el.innerHTML = s; cursor.execute(q)', 'paſſ', 'exeC', 'WHERE id = 1']:
+        expected = {name for name, matcher in groups.matchers.items() if matcher.search(text)}
+        assert groups.present(text) == fallback.present(text) == expected
+    assert groups.present('eval(x)') == {'xss', 'code'}
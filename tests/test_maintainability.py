@@ -0,0 +1,85 @@
+"""Tests for the maintainability scorer."""
+
+from code_guardian.config import Config
+from code_guardian.maintainability import MaintainabilityScorer
+
+
+def _scorer(tmp_path, **settings):
+    """Build a scorer whose cache lives under tmp_path."""
+    config = Config()
+    config.set('cache.directory', str(tmp_path / 'cache'))
+    for key, value in settings.items():
+        config.set(key, value)
+    return MaintainabilityScorer(config)
+
+
+def test_score_files_matches_serial_scoring(tmp_path):
+    """Test that batch scoring returns the per-file results in input order."""
+    scorer = _scorer(tmp_path, **{'parallel.max_workers': 2})
+    file_items = [
+        (f'module_{i}.py', f'def Compute_{i}(a, b):\n    return a * {i + 100}  # TODO\n')
+        for i in range(40)
+    ]
+
+    results = scorer.score_files(file_items)
+
+    assert results == [scorer.score_file(file_path, content) for file_path, content in file_items]
+
+
+def test_score_files_reuses_cached_results(tmp_path):
+    """Test that a second batch over unchanged content is served from the cache."""
+    file_items = [('a.py', 'def Bad():\n    return 1000\n'), ('b.py', 'x = 1\n')]
+
+    first = _scorer(tmp_path).score_files(file_items)
+    scorer = _scorer(tmp_path)
+    assert scorer.result_cache is None  # Opened by score_files, which score_file never needs
+    second = scorer.score_files(file_items)
+
+    assert second == first
+    assert scorer.result_cache.hits == 2
+    assert scorer.result_cache.misses == 0
+
+    # Different settings must not reuse the entries
+    other = _scorer(tmp_path, **{'maintainability.max_function_length': 1})
+    other.score_files(file_items)
+    assert other.result_cache.hits == 0
+
+
+def test_minified_and_oversized_files_are_not_scored(tmp_path):
+    """Test that minified bundles and files over max_file_size are skipped."""
+    scorer = _scorer(tmp_path, **{'maintainability.max_file_size': 100})
+    long_line = 'x' * 150 + '\n'
+
+    assert scorer.score_file('bundle.min.js', long_line) == ([], 10.0)
+    assert scorer.score_file('big.py', long_line) == ([], 10.0)
+    assert scorer.score_file('small.js', long_line[:90] + '  # TODO\n')[0]
+
+
+def test_rule_is_reported_once_per_line(tmp_path):
+    """Test that a long parameter list flagged by two checks yields one issue."""
+    scorer = _scorer(tmp_path)
+    content = 'def build(alpha, beta, gamma, delta, epsilon, zeta, eta):\n    return alpha\n'
+
+    issues, _ = scorer.score_file('builder.py', content)
+
+    messages = [issue.message for issue in issues if issue.rule_id == 'maintainability.too_many_params']
+    assert messages == ['Function has too many parameters (7)']
+
+
+def test_distinct_findings_on_one_line_are_kept(tmp_path):
+    """Test that only exact repeats are dropped when a rule fires twice on one line."""
+    scorer = _scorer(tmp_path)
+
+    issues, _ = scorer.score_file('unpack.py', 'v, r, v = 1, 2, 3\n')
+    short_names = [issue.message for issue in issues if issue.rule_id == 'maintainability.short_variable_name']
+
+    assert len(short_names) == 2
+    assert short_names[0] != short_names[1]
+
+
+def test_cached_results_depend_on_max_file_size(tmp_path):
+    """Test that changing max_file_size between cached runs is not served stale results."""
+    file_items = [('a.py', 'def Bad():\n    return 1000\n')]
+
+    assert _scorer(tmp_path).score_files(file_items)[0][0]
+    assert _scorer(tmp_path, **{'maintainability.max_file_size': 10}).score_files(file_items) == [([], 10.0)]
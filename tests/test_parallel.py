@@ -0,0 +1,35 @@
+"""Tests for the shared process pool helper."""
+
+from code_guardian.config import Config
+from code_guardian.parallel import run_pooled
+
+
+class Doubler:
+    """Object built per worker from a config."""
+
+    def __init__(self, config):
+        self.config = config
+        self.calls = 0
+
+    def double(self, value):
+        self.calls += 1
+        return value * 2
+
+
+def test_run_pooled_keeps_input_order():
+    """Test that pooled results come back in input order."""
+    config = Config()
+    config.set('parallel.max_workers', 2)
+    items = [(i,) for i in range(50)]
+
+    assert run_pooled(Doubler, 'double', items, config, 8) == [i * 2 for i in range(50)]
+
+
+def test_run_pooled_runs_serially_on_local_object():
+    """Test that without parallelism the items run on the given local object."""
+    config = Config()
+    config.set('parallel.enabled', False)
+    local = Doubler(config)
+
+    assert run_pooled(Doubler, 'double', [(1,), (2,)], config, 8, local=local) == [2, 4]
+    assert local.calls == 2
@@ -0,0 +1,88 @@
+"""Tests for the performance analyzer."""
+
+from code_guardian import performance
+from code_guardian.config import Config
+from code_guardian.performance import PerformanceAnalyzer
+from code_guardian.source import SourceLines
+
+
+def test_pattern_issues_follow_line_order():
+    """Test that pattern issues are reported per line, in line order, whatever the line breaks."""
+    analyzer = PerformanceAnalyzer(Config())
+    content = ('for i in range(len(items)):\r\n'
+               '    total += [i]\r\n'
+               'while len(queue) > 0: pass\x0c'
+               'items.append(1)\n'
+               'for x in y: pass\n')
+
+    issues, _ = analyzer.analyze_file('loops.txt', content)
+
+    assert [(issue.line_number, issue.message) for issue in issues] == [
+        (1, 'Inefficient loop - use enumerate() or direct iteration'),
+        (2, 'Potential memory inefficiency with list concatenation'),
+        (3, 'Inefficient while loop checking length'),
+    ]
+    assert issues[1].source_snippet == 'total += [i]'
+
+
+def test_patterns_ignore_case():
+    """Test that patterns match regardless of case, including characters re folds to ASCII."""
+    analyzer = PerformanceAnalyzer(Config())
+    content = 'x = 1\nFOR I IN RANGE(LEN(ITEMS)): pass\nfor ı ın range(len(items)): pass\n'
+
+    issues, _ = analyzer.analyze_file('loops.txt', content)
+
+    assert [issue.line_number for issue in issues] == [2, 3]
+
+
+def test_analyze_files_matches_serial_analysis():
+    """Test that batch analysis returns the per-file results in input order."""
+    config = Config()
+    config.set('parallel.max_workers', 2)
+    analyzer = PerformanceAnalyzer(config)
+    file_items = [
+        (f'module_{i}.py', f'def run_{i}(items):\n    for i in range(len(items)):\n        items.append(i)\n')
+        for i in range(40)
+    ]
+
+    results = analyzer.analyze_files(file_items)
+
+    assert results == [analyzer.analyze_file(file_path, content) for file_path, content in file_items]
+
+
+def test_oversized_and_binary_files_are_not_analyzed():
+    """Test that files over max_file_size and files containing NUL bytes are skipped."""
+    config = Config()
+    config.set('performance.max_file_size', 100)
+    analyzer = PerformanceAnalyzer(config)
+    loop = 'for i in range(len(items)): pass\n'
+
+    assert analyzer.analyze_file('big.py', loop * 4) == ([], 10.0)
+    assert analyzer.analyze_file('blob.py', '\x00' + loop) == ([], 10.0)
+    assert analyzer.analyze_file('small.py', loop)[0]
+
+
+def test_long_near_miss_lines_do_not_backtrack():
+    """Test that a long line that almost matches a '.*'-gapped pattern is checked in linear time."""
+    analyzer = PerformanceAnalyzer(Config())
+    near_miss = 'total += [item ' * 2000
+
+    assert analyzer.analyze_file('lists.txt', near_miss + '\n')[0] == []
+    assert [issue.line_number for issue in analyzer.analyze_file('lists.txt', f'x\n{near_miss}]\n')[0]] == [2]
+
+
+def test_anchor_prescreen_matches_candidate_scan():
+    """Test that screening lines by pattern anchors finds the same rows as the fused candidate regex."""
+    source = SourceLines('for i in RANGE(LEN(x)): total += [i]\r\n'
+                         'ſelf.data.copy() in loop; while len(q) > 1\u2028'
+                         'pd.concat(frames) inside a for\n'
+                         'requests.get(url) for\x85x += 1\n')
+    rows = performance._ALL_PATTERNS
+    matchers = performance._ALL_LINE_MATCHERS
+    anchors = performance._anchor_automaton(rows)
+
+    expected = list(performance._matching_rows(source, rows, matchers, performance._ALL_CANDIDATES_RE))
+    screened = list(performance._matching_rows(source, rows, matchers, performance._ALL_CANDIDATES_RE, anchors))
+
+    assert [line_num for line_num, _, _ in expected] == [1, 1, 2, 2, 3, 4]
+    assert screened == expected
@@ -0,0 +1,86 @@
+"""Tests for report generation."""
+
+import json
+
+from code_guardian.ai_detector import AIPattern
+from code_guardian.config import Config
+from code_guardian.models import AnalysisResults, Issue
+from code_guardian.report import ReportGenerator
+
+
+def test_json_report_round_trip(tmp_path):
+    """Test that the streamed JSON report is valid and includes AI patterns."""
+    pattern = AIPattern('comments', 0.8, 'AI-style comment', 3, '# Step 1:')
+    results = AnalysisResults(
+        files_scanned=1,
+        issues=[
+            Issue('high', 'security', 'Use of eval()', 'app.py', 4),
+            Issue('low', 'maintainability', 'Line too long', 'app.py', 9),
+        ],
+        file_scores={'app.py': {'ai_confidence': 0.8, 'ai_patterns': [pattern]}},
+    )
+    output = tmp_path / 'report.json'
+
+    ReportGenerator(Config()).generate_json_report(results, str(output))
+    report = json.loads(output.read_text(encoding='utf-8'))
+
+    assert [i['message'] for i in report['issues']] == ['Use of eval()', 'Line too long']
+    assert report['summary']['total_issues'] == 2
+    assert report['metadata']['generated_at'].endswith('+00:00')
+    assert report['issues_by_severity'] == {'critical': 0, 'high': 1, 'medium': 0, 'low': 1}
+    assert report['file_scores']['app.py']['ai_patterns'][0]['evidence'] == '# Step 1:'
+
+
+def test_json_report_without_issues(tmp_path):
+    """Test that an empty scan still produces a valid report."""
+    output = tmp_path / 'report.json'
+
+    ReportGenerator(Config()).generate_json_report(AnalysisResults(), str(output))
+
+    assert json.loads(output.read_text(encoding='utf-8'))['issues'] == []
+
+
+def test_sarif_report_round_trip(tmp_path):
+    """Test that the SARIF report is valid JSON with one rule per rule id."""
+    results = AnalysisResults(issues=[
+        Issue('high', 'security', 'Use of eval()', 'app.py', 4, rule_id='security.eval'),
+        Issue('high', 'security', 'Use of eval()', 'lib.py', 7, rule_id='security.eval'),
+    ])
+    output = tmp_path / 'report.sarif'
+
+    ReportGenerator(Config()).generate_sarif_report(results, str(output))
+    run = json.loads(output.read_text(encoding='utf-8'))['runs'][0]
+
+    assert [rule['id'] for rule in run['tool']['driver']['rules']] == ['security.eval']
+    assert [r['locations'][0]['physicalLocation']['region']['startLine'] for r in run['results']] == [4, 7]
+
+
+def test_html_report_escapes_source_snippets(tmp_path):
+    """Test that issue text is HTML-escaped in the HTML report."""
+    results = AnalysisResults(issues=[
+        Issue('medium', 'security', 'Possible XSS', 'app.js', 3, source_snippet='el.innerHTML = "<b>"'),
+    ])
+    output = tmp_path / 'report.html'
+
+    ReportGenerator(Config()).generate_html_report(results, str(output))
+    html = output.read_text(encoding='utf-8')
+
+    assert '<code>el.innerHTML = &#34;&lt;b&gt;&#34;</code>' in html
+
+
+def test_json_report_is_compact_unless_pretty(tmp_path):
+    """Test that reporting.pretty only changes the layout of the JSON report."""
+    results = AnalysisResults(issues=[Issue('high', 'security', 'Use of eval()', 'app.py', 4)])
+    compact, pretty = tmp_path / 'compact.json', tmp_path / 'pretty.json'
+    config = Config()
+
+    ReportGenerator(config).generate_json_report(results, str(compact))
+    config.set('reporting.pretty', True)
+    ReportGenerator(config).generate_json_report(results, str(pretty))
+
+    assert compact.read_text(encoding='utf-8').count('\n') == 1
+    assert pretty.read_text(encoding='utf-8').startswith('{\n  "metadata": ')
+    compact_report = json.loads(compact.read_text(encoding='utf-8'))
+    pretty_report = json.loads(pretty.read_text(encoding='utf-8'))
+    assert compact_report['issues'] == pretty_report['issues']
+    assert compact_report['summary'] == pretty_report['summary']
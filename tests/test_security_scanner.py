@@ -3,6 +3,7 @@
 import pytest
 from code_guardian.scanner import SecurityScanner
 from code_guardian.config import Config
+from code_guardian.source import SourceLines
 
 
 def test_security_scanner_initialization():
@@ -134,4 +135,75 @@ query = "SELECT * FROM users WHERE id = " + user_id
 
     # These should be empty since we disabled the checks
     assert len(sql_issues) == 0
-    assert len(secret_issues) == 0
\ No newline at end of file
+    assert len(secret_issues) == 0
+
+def test_scan_files_matches_serial_scan():
+    """Test that batch scanning returns the per-file issues in input order."""
+    config = Config()
+    config.set('parallel.max_workers', 2)
+    scanner = SecurityScanner(config)
+    file_items = [
+        (f'module_{i}.py', f'import pickle\nquery = "SELECT * FROM t WHERE id = " + str({i})\nexec(code_{i})\n')
+        for i in range(80)
+    ]
+
+    results = scanner.scan_files(file_items)
+
+    assert results == [scanner.scan_file(file_path, content) for file_path, content in file_items]
+    assert len(results[0]) == 4
+
+
+def test_shared_source_lines_match_own_split():
+    """Test that scanning with a prebuilt SourceLines finds the same issues."""
+    scanner = SecurityScanner(Config())
+    content = 'import pickle\r\nquery = "SELECT * FROM t WHERE id = " + uid\r\neval(data)\n'
+
+    issues = scanner.scan_file('test.py', content, source=SourceLines(content))
+
+    assert issues == scanner.scan_file('test.py', content)
+    assert {issue.line_number for issue in issues} == {1, 2, 3}
+
+
+def test_ast_issues_follow_source_order():
+    """Test that AST findings come out parents first, in source order, for nested calls and strings."""
+    scanner = SecurityScanner(Config())
+    code = '''import pickle
+exec(eval("QUJDREVGR0hJSktMTU5PUFFSU1RVVldY"))
+os.system(cmd)
+'''
+
+    issues = scanner._scan_python_ast('test.py', code)
+
+    assert [(issue.rule_id, issue.line_number) for issue in issues] == [
+        ('security.risky_import', 1),
+        ('security.dangerous_call', 2),
+        ('security.dangerous_call', 2),
+        ('security.potential_secret', 2),
+        ('security.command_injection', 3),
+    ]
+    assert [issue.message for issue in issues[1:3]] == ['Dangerous use of exec() function',
+                                                         'Dangerous use of eval() function']
+
+
+def test_potential_secret_literals():
+    """Test which string literals count as base64-like secrets."""
+    scanner = SecurityScanner(Config())
+    code = '''a = "QUJDREVGR0hJSktMTU5PUFFSU1RVVldY"
+b = "QUJDREVGR0hJSktMTU5PUFFSU1RVVldY\\n"
+c = "QUJDREVGR0hJSktM\\nTU5PUFFSU1RVVldY"
+d = "QUJDREVGR0hJSktMTU5PUFFSU1RVVldY!"
+e = "QUJDREVGR0hJSktMTU5P"
+'''
+
+    issues = scanner._scan_python_ast('test.py', code)
+
+    assert [issue.line_number for issue in issues if issue.rule_id == 'security.potential_secret'] == [1, 2]
+
+
+def test_long_near_miss_lines_do_not_backtrack():
+    """Test that a long line that almost matches a '.*'-gapped pattern is checked in linear time."""
+    scanner = SecurityScanner(Config())
+    near_miss = 'cursor.execute("' + '%' * 100000
+
+    assert scanner.scan_file('db.txt', near_miss + '\n') == []
+    assert [issue.line_number for issue in scanner.scan_file('db.txt', f'x\n{near_miss}"\n')] == [2]